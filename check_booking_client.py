@@ -0,0 +1,103 @@
+"""
+Check the chatbot's BookingAPIClient (Untitled19.ipynb) against a local stand-in server.
+
+The class is loaded straight from the notebook, so this checks the code that
+actually ships. The stand-in server answers /slow after 200 ms and fails /flaky
+with a 503 every other call. Needs only httpx:
+
+    python check_booking_client.py
+"""
+import ast
+import asyncio
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import httpx
+
+NOTEBOOK = Path(__file__).resolve().parent / 'Untitled19.ipynb'
+CONCURRENT_CALLS = 20
+DELAY = 0.2
+
+
+def load_client_class():
+    """Exec just the BookingAPIClient class out of the notebook (the rest needs Colab)."""
+    cells = json.loads(NOTEBOOK.read_text(encoding='utf-8'))['cells']
+    for cell in cells:
+        source = ''.join(cell['source'])
+        if 'class BookingAPIClient' not in source:
+            continue
+        for node in ast.parse(source).body:
+            if isinstance(node, ast.ClassDef) and node.name == 'BookingAPIClient':
+                namespace = {'asyncio': asyncio, 'httpx': httpx, 'random': random}
+                exec(ast.get_source_segment(source, node), namespace)
+                return namespace['BookingAPIClient']
+    raise SystemExit(f"BookingAPIClient not found in {NOTEBOOK.name}")
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real backend
+    flaky_calls = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        if self.path == '/slow':
+            time.sleep(DELAY)
+            self.reply(200, b'{"ok": true}')
+        elif self.path == '/flaky':
+            with self.lock:
+                StandInHandler.flaky_calls += 1
+                fail = StandInHandler.flaky_calls % 2 == 1
+            if fail:
+                self.reply(503, b'{"error": "unavailable"}')
+            else:
+                self.reply(200, b'{"ok": true}')
+        else:
+            self.reply(404, b'{}')
+
+    def reply(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def run_checks(base_url):
+    BookingAPIClient = load_client_class()
+    client = BookingAPIClient(base_url, backoff=0.05)
+    try:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.request('GET', '/slow') for _ in range(CONCURRENT_CALLS)))
+        elapsed = time.perf_counter() - start
+        assert all(response.status_code == 200 for response in responses), [r.status_code for r in responses]
+        serial = CONCURRENT_CALLS * DELAY
+        print(f"{CONCURRENT_CALLS} concurrent {DELAY * 1000:.0f} ms calls: {elapsed:.2f}s ({serial:.1f}s serialized)")
+        # max_concurrency calls run at once, so this takes a couple of DELAYs, not CONCURRENT_CALLS of them
+        assert elapsed < serial / 2, "calls were not overlapped"
+
+        response = await client.request('GET', '/flaky')
+        print(f"flaky endpoint: {response.status_code} after {StandInHandler.flaky_calls} attempts")
+        assert response.status_code == 200 and StandInHandler.flaky_calls == 2
+    finally:
+        await client.aclose()
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        asyncio.run(run_checks(f'http://127.0.0.1:{server.server_port}'))
+    finally:
+        server.shutdown()
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { authService, museumService } from './services';
+import { authService, museumService, unwrapPage } from './services';
 import { API_ENDPOINTS } from './config';
 import APIDebugger from './APIDebugger';
 import './App.css';
@@ -70,7 +70,7 @@ function App() {
         headers: {
           'Content-Type': 'application/json',
           'Authorization': `Bearer ${token}`,
-          'Accept': 'application/json'
+          'Accept': 'text/event-stream, application/json'
         },
         body: JSON.stringify({
           user_query: userMessage,
@@ -78,19 +78,59 @@ function App() {
         })
       });
 
-      // Remove typing indicator
-      setChatMessages(prev => prev.filter(msg => !msg.isTyping));
+      if (!response.ok) {
+        // Remove typing indicator
+        setChatMessages(prev => prev.filter(msg => !msg.isTyping));
+        throw new Error(`Server error: ${response.status}`);
+      }
 
-      if (response.ok) {
+      const contentType = response.headers.get('content-type') || '';
+      if (contentType.includes('text/event-stream') && response.body) {
+        // Streamed answer: the typing bubble becomes the bot message and grows token by token
+        const showBotText = (text) => setChatMessages(prev => [
+          ...prev.filter(msg => !msg.isTyping && !msg.isStreaming),
+          { text, type: 'bot', isStreaming: true }
+        ]);
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let botText = '';
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, { stream: true });
+          const frames = buffer.split('\n\n');
+          buffer = frames.pop();
+          for (const frame of frames) {
+            const event = (frame.match(/^event: (.*)$/m) || [])[1];
+            const data = (frame.match(/^data: (.*)$/m) || [])[1];
+            if (!event || !data) continue;
+            const payload = JSON.parse(data);
+            if (event === 'token') {
+              botText += payload.text;
+            } else if (event === 'booking' || event === 'message') {
+              botText = payload.text;  // Structured result replaces any streamed text
+              if (event === 'booking' && payload.booking_id) loadBookings();  // Show the new booking in the list
+            } else if (event === 'error') {
+              throw new Error(payload.text);
+            }
+            if (botText) showBotText(botText);
+          }
+        }
+        setChatMessages(prev => [
+          ...prev.filter(msg => !msg.isTyping && !msg.isStreaming),
+          { text: botText || 'I received your message!', type: 'bot' }
+        ]);
+      } else {
+        // Remove typing indicator
+        setChatMessages(prev => prev.filter(msg => !msg.isTyping));
         const data = await response.json();
         const botResponse = data.response || data.answer || data.message || 'I received your message!';
         setChatMessages(prev => [...prev, { text: botResponse, type: 'bot' }]);
-      } else {
-        throw new Error(`Server error: ${response.status}`);
       }
     } catch (error) {
       // Remove typing indicator
-      setChatMessages(prev => prev.filter(msg => !msg.isTyping));
+      setChatMessages(prev => prev.filter(msg => !msg.isTyping && !msg.isStreaming));
       
       let errorMessage = 'Sorry, I encountered an error. ';
       if (error.message.includes('log in')) {
@@ -246,18 +286,33 @@ function App() {
     try {
       console.log('Loading museums...');
       // Since browse is now public, we can call it without token
-      const response = await fetch(API_ENDPOINTS.BROWSE_MUSEUMS, {
-        method: 'GET',
-        headers: {
-          'Content-Type': 'application/json',
-          'ngrok-skip-browser-warning': 'true'
+      // The list is cursor-paginated: keep following `next` until the last page
+      let url = API_ENDPOINTS.BROWSE_MUSEUMS;
+      let response;
+      let museumsData = [];
+      while (url) {
+        response = await fetch(url, {
+          method: 'GET',
+          headers: {
+            'Content-Type': 'application/json',
+            'ngrok-skip-browser-warning': 'true'
+          }
+        });
+        console.log('Museums response status:', response.status);
+        if (!response.ok) {
+          break;
         }
-      });
-      
-      console.log('Museums response status:', response.status);
+        const data = await response.json();
+        const page = unwrapPage(data);
+        if (!Array.isArray(page)) {
+          museumsData = page;
+          break;
+        }
+        museumsData = museumsData.concat(page);
+        url = Array.isArray(data) ? null : data.next;
+      }
       
       if (response.ok) {
-        const museumsData = await response.json();
         console.log('Museums data:', museumsData);
         
         if (Array.isArray(museumsData)) {
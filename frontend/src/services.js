@@ -6,6 +6,24 @@ const api = axios.create({
   timeout: 10000,
 });
 
+// List endpoints are cursor-paginated ({ next, previous, results })
+export const unwrapPage = (data) => (Array.isArray(data) ? data : data?.results);
+
+// Follow the `next` cursors and return every item of a paginated list
+export const fetchAllPages = async (url, headers) => {
+  let items = [];
+  while (url) {
+    const response = await api.get(url, { headers });
+    const page = unwrapPage(response.data);
+    if (!Array.isArray(page)) {
+      return page;
+    }
+    items = items.concat(page);
+    url = Array.isArray(response.data) ? null : response.data.next;
+  }
+  return items;
+};
+
 // Authentication Services
 export const authService = {
   // Login user
@@ -79,10 +97,7 @@ export const museumService = {
   // Browse all museums
   browseMuseums: async (token) => {
     try {
-      const response = await api.get(API_ENDPOINTS.BROWSE_MUSEUMS, {
-        headers: getHeaders(token)
-      });
-      return response.data;
+      return await fetchAllPages(API_ENDPOINTS.BROWSE_MUSEUMS, getHeaders(token));
     } catch (error) {
       throw error.response?.data || error.message;
     }
@@ -103,10 +118,7 @@ export const museumService = {
   // Get user bookings
   getMyBookings: async (token) => {
     try {
-      const response = await api.get(API_ENDPOINTS.MY_BOOKINGS, {
-        headers: getHeaders(token)
-      });
-      return response.data;
+      return await fetchAllPages(API_ENDPOINTS.MY_BOOKINGS, getHeaders(token));
     } catch (error) {
       throw error.response?.data || error.message;
     }
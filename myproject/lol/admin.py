@@ -1,8 +1,45 @@
 from django.contrib import admin
-from .models import Museum, Exhibit, Ticket, Visitor, Booking
+from django.db import transaction
+from . import inventory, occupancy
+from .models import Museum, Exhibit, Ticket, Visitor, Booking, SlotInventory, DailySummary
 
 admin.site.register(Museum)
 admin.site.register(Exhibit)
 admin.site.register(Ticket)
 admin.site.register(Visitor)
-admin.site.register(Booking)
+
+
+@admin.register(Booking)
+class BookingAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'museum', 'ticket', 'visit_date', 'booking_date')
+    # Booking.__str__ and the columns above need these; avoids a query per row
+    list_select_related = ('visitor', 'museum', 'ticket')
+    raw_id_fields = ('visitor',)
+
+    # Deleting here is a cancellation: hand the tickets back and update the daily totals
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            inventory.release(obj.museum_id, obj.visit_date, obj.slot, obj.quantity)
+            occupancy.cancelled(obj)
+            super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            bookings = list(queryset.select_related('ticket'))
+            inventory.release_many(bookings)
+            occupancy.cancelled_many(bookings)
+            super().delete_queryset(request, queryset)
+
+
+@admin.register(SlotInventory)
+class SlotInventoryAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'visit_date', 'slot', 'remaining', 'capacity')
+    list_select_related = ('museum',)
+
+
+@admin.register(DailySummary)
+class DailySummaryAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'visit_date', 'bookings', 'tickets', 'revenue')
+    list_select_related = ('museum',)
+    # Maintained by lol/occupancy.py; fix drift with `manage.py rebuild_daily_summary`
+    readonly_fields = ('museum', 'visit_date', 'bookings', 'tickets', 'revenue')
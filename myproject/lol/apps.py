@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class LolConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'lol'
+
+    def ready(self):
+        from . import signals  # noqa: F401 - registers the catalogue cache invalidation receivers
@@ -0,0 +1,134 @@
+"""
+Async (ASGI) versions of the chatbot read and booking APIs.
+
+They return the same JSON as the DRF endpoints in views.py but run on the
+event loop under uvicorn/daphne, using Django's async ORM. Only the booking
+write itself (inventory reservation + insert) hops to a thread, because
+transactions are not supported in async code.
+"""
+from datetime import date
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.http import HttpResponseNotModified, JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+from . import catalogue, inventory, occupancy
+from .authentication import CachedJWTAuthentication
+from .conditional import abookings_etag, acatalogue_etag
+from .models import Booking, Museum, Ticket
+from .visitors import aresolve_visitor
+from .views import _booking_api_data, _museum_api_data, _reserve_and_create_booking
+
+
+async def _authenticate(request):
+    """Resolve the bearer token to a user, or None if missing/invalid."""
+    try:
+        result = await sync_to_async(CachedJWTAuthentication().authenticate)(request)
+    except (AuthenticationFailed, InvalidToken):
+        return None
+    return result[0] if result else None
+
+
+def _unauthorized():
+    return JsonResponse(
+        {"detail": "Authentication credentials were not provided or are invalid."},
+        status=status.HTTP_401_UNAUTHORIZED,
+    )
+
+
+def _not_modified(request, etag):
+    if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+    return None
+
+
+@require_GET
+async def browse_museums_api(request):
+    """Full museum list (the ?all=true shape), cached per catalogue version."""
+    etag = await acatalogue_etag(request)
+    cached_response = _not_modified(request, etag)
+    if cached_response:
+        return cached_response
+
+    async def build():
+        return _museum_api_data([museum async for museum in Museum.objects.all()])
+
+    response = JsonResponse(await catalogue.acached('async_browse_museums_api', build), safe=False)
+    response['ETag'] = etag
+    return response
+
+
+@require_GET
+async def user_bookings_api(request):
+    user = await _authenticate(request)
+    if user is None:
+        return _unauthorized()
+
+    etag = await abookings_etag(request, user)
+    cached_response = _not_modified(request, etag)
+    if cached_response:
+        return cached_response
+
+    bookings = (
+        Booking.objects.filter(visitor__user=user)
+        .select_related('museum', 'ticket')
+        .only('id', 'visit_date', 'quantity', 'museum__name', 'museum__location', 'ticket__id', 'ticket__price')
+    )
+    response = JsonResponse(_booking_api_data([booking async for booking in bookings]), safe=False)
+    response['ETag'] = etag
+    return response
+
+
+@csrf_exempt
+@require_POST
+async def book_museum_api(request, museum_id):
+    user = await _authenticate(request)
+    if user is None:
+        return _unauthorized()
+
+    try:
+        museum = await Museum.objects.aget(id=museum_id)
+    except Museum.DoesNotExist:
+        return JsonResponse({"error": "Museum not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    visitor = await aresolve_visitor(user)
+    default_ticket = await Ticket.objects.afirst()
+    if not default_ticket:
+        return JsonResponse({"error": "No tickets available for booking"}, status=status.HTTP_400_BAD_REQUEST)
+
+    data, code = await sync_to_async(_reserve_and_create_booking)(visitor, default_ticket, museum, date.today())
+    return JsonResponse(data, status=code)
+
+
+def _cancel(booking):
+    with transaction.atomic():
+        inventory.release(booking.museum_id, booking.visit_date, booking.slot, booking.quantity)
+        occupancy.cancelled(booking)
+        booking.delete()
+
+
+@csrf_exempt
+@require_POST
+async def cancel_booking_api(request, booking_id):
+    user = await _authenticate(request)
+    if user is None:
+        return _unauthorized()
+
+    try:
+        booking = await Booking.objects.select_related('museum', 'ticket').aget(id=booking_id, visitor__user=user)
+    except Booking.DoesNotExist:
+        return JsonResponse(
+            {"error": "Booking not found or you don't have permission to cancel it"},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    await sync_to_async(_cancel)(booking)
+    return JsonResponse({
+        "message": f"Booking for {booking.museum.name} on {booking.visit_date} has been cancelled successfully",
+        "cancelled_booking_id": booking_id
+    })
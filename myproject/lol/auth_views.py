@@ -1,19 +1,16 @@
 from django.contrib.auth.views import LoginView
-from .token_manager import get_user_token
+from .token_manager import get_tokens_for_user
 
 class CustomLoginView(LoginView):
     def form_valid(self, form):
         """Called when valid form data has been POSTed"""
-        # Get token before login
-        token = get_user_token(
-            username=form.cleaned_data['username'],
-            password=form.cleaned_data['password']
-        )
+        # The form already checked the password; mint tokens for that user in-process
+        tokens = get_tokens_for_user(form.get_user())
         
         response = super().form_valid(form)  # This performs the login
         
-        # Store token in session after successful login
-        if token:
-            self.request.session['access_token'] = token
+        # Store tokens in session after successful login (login() cycles the session key, not its data)
+        self.request.session['access_token'] = tokens['access']
+        self.request.session['refresh_token'] = tokens['refresh']
         
         return response
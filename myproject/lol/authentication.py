@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from . import catalogue
+
+
+def auth_version_key(user_id):
+    """Version counter bumped whenever the user row changes (deactivation, password, ...)."""
+    return f'lol:auth:version:{user_id}'
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that remembers the user behind each verified token.
+
+    The signature and expiry are still checked on every request (cheap, no DB),
+    but the User lookup is skipped while the token is alive. Entries live in a
+    bounded per-process LRU and are dropped as soon as the user's auth version
+    moves, see lol/signals.py.
+
+    The version is bumped by the User post_save/post_delete signals, so changes
+    made with QuerySet.update() (e.g. ``User.objects.filter(...).update(is_active=False)``)
+    are not seen until the token expires; use save() or bump auth_version_key()
+    yourself. The version lives in the default cache: with a process-local one
+    (LocMem) and WEB_CONCURRENCY > 1 the other workers would never see the bump,
+    so the lookup is not cached at all.
+    """
+    max_size = getattr(settings, 'JWT_USER_CACHE_SIZE', 1024)
+    _entries = OrderedDict()  # jti -> (user, expires_at, auth_version)
+    _lock = threading.Lock()
+
+    @staticmethod
+    def enabled():
+        """Only cache when every worker sees the same auth versions."""
+        return not (catalogue.is_process_local() and getattr(settings, 'WEB_CONCURRENCY', 1) > 1)
+
+    def get_user(self, validated_token):
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if jti is None or user_id is None or not self.enabled():
+            return super().get_user(validated_token)
+
+        auth_version = catalogue.get_version(auth_version_key(user_id))
+        with self._lock:
+            entry = self._entries.get(jti)
+            if entry is not None:
+                user, expires_at, cached_version = entry
+                if cached_version == auth_version and expires_at > time.time():
+                    self._entries.move_to_end(jti)
+                    return user
+                del self._entries[jti]
+
+        user = super().get_user(validated_token)  # Does the DB lookup and active/revocation checks
+
+        with self._lock:
+            self._entries[jti] = (user, validated_token.get('exp', 0), auth_version)
+            self._entries.move_to_end(jti)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return user
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._entries.clear()
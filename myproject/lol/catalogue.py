@@ -0,0 +1,98 @@
+import hashlib
+import time
+from django.core.cache import cache, caches, DEFAULT_CACHE_ALIAS
+from django.core.cache.backends.locmem import LocMemCache
+
+VERSION_KEY = 'lol:catalogue:version'
+CATALOGUE_TIMEOUT = 60 * 60 * 24  # Entries are also orphaned by a version bump, this just bounds their lifetime
+
+
+def get_version(key=VERSION_KEY):
+    """Current catalogue version (or any other version counter stored under `key`)."""
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so a version lost to eviction/restart never reuses an old number
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key=VERSION_KEY):
+    """Invalidate everything derived from the version stored under `key`."""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Key missing (first write or evicted): seeding it is already a new version
+        return get_version(key)
+
+
+def is_process_local():
+    """
+    True when the cache lives in this process (LocMemCache), so a bump_version()
+    from a management command never reaches the running web servers.
+    """
+    return isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache)
+
+
+PROCESS_LOCAL_WARNING = (
+    "The default cache is process-local (LocMemCache): running servers keep serving their cached "
+    "catalogue and search index until they restart. Configure a shared cache backend "
+    "(FileBasedCache, Redis, ...) in CACHES to invalidate them from here."
+)
+
+
+async def aget_version(key=VERSION_KEY):
+    """Async counterpart of get_version() for the ASGI views."""
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def bookings_version_key(user_id):
+    """Version counter for one user's bookings, bumped on every booking write."""
+    return f'lol:bookings:version:{user_id}'
+
+
+def cached(name, builder):
+    """
+    Return the value cached under `name` for the current catalogue version,
+    calling `builder()` to compute and store it on a miss.
+    Works with any Django cache backend (LocMem, file-based, Redis, ...).
+    """
+    digest = hashlib.md5(name.encode()).hexdigest()
+    key = f'lol:catalogue:{get_version()}:{digest}'
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        cache.set(key, value, timeout=CATALOGUE_TIMEOUT)
+    return value
+
+
+async def acached(name, builder):
+    """Async counterpart of cached(); `builder` is an async callable."""
+    digest = hashlib.md5(name.encode()).hexdigest()
+    key = f'lol:catalogue:{await aget_version()}:{digest}'
+    value = await cache.aget(key)
+    if value is None:
+        value = await builder()
+        await cache.aset(key, value, timeout=CATALOGUE_TIMEOUT)
+    return value
+
+
+def museum_list():
+    """All museums as model instances, served from cache in the steady state."""
+    from .models import Museum
+    return cached('museums', lambda: list(Museum.objects.all()))
+
+
+def touch_museums(museum_ids):
+    """
+    Move the museums' updated_at without firing post_save, so template
+    fragments keyed on it (the exhibit list in museum_detail.html, the
+    browse.html card) re-render after an exhibit changes.
+    """
+    from django.utils import timezone
+    from .models import Museum
+    Museum.objects.filter(pk__in=museum_ids).update(updated_at=timezone.now())
@@ -0,0 +1,43 @@
+import hashlib
+from rest_framework import status
+from rest_framework.response import Response
+from . import catalogue
+
+
+def make_etag(request, version, scope):
+    """
+    Strong ETag from a version counter, without touching the response body.
+    The absolute URL is mixed in because cursors/page size/host change the payload.
+    """
+    url_hash = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()[:12]
+    return f'"{scope}-{version}-{url_hash}"'
+
+
+def catalogue_etag(request):
+    return make_etag(request, catalogue.get_version(), 'catalogue')
+
+
+def bookings_etag(request):
+    # Bookings embed museum name/location, so a catalogue change must invalidate them too
+    version = f'{catalogue.get_version(catalogue.bookings_version_key(request.user.pk))}.{catalogue.get_version()}'
+    return make_etag(request, version, f'bookings-{request.user.pk}')
+
+
+async def acatalogue_etag(request):
+    return make_etag(request, await catalogue.aget_version(), 'catalogue')
+
+
+async def abookings_etag(request, user):
+    version = f'{await catalogue.aget_version(catalogue.bookings_version_key(user.pk))}.{await catalogue.aget_version()}'
+    return make_etag(request, version, f'bookings-{user.pk}')
+
+
+def not_modified(request, etag):
+    """Return a 304 Response if the client already has `etag`, else None."""
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    if etag in candidates or '*' in candidates:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response['ETag'] = etag
+        return response
+    return None
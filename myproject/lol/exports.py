@@ -0,0 +1,97 @@
+"""
+Streaming booking exports (visitor lists per museum and date range).
+
+Rows come straight from a values_list() projection read with
+.iterator(chunk_size), and are turned into CSV or NDJSON lines one at a
+time, so neither model instances nor the whole payload are ever held in
+memory. Used by the export API view and the export_bookings command.
+"""
+import csv
+import json
+from rest_framework.renderers import BaseRenderer
+from .models import Booking
+
+CHUNK_SIZE = 2000
+
+# (output column, Booking lookup) in export order
+FIELDS = [
+    ('booking_id', 'id'),
+    ('museum_id', 'museum_id'),
+    ('museum_name', 'museum__name'),
+    ('visit_date', 'visit_date'),
+    ('slot', 'slot'),
+    ('quantity', 'quantity'),
+    ('ticket_id', 'ticket_id'),
+    ('ticket_price', 'ticket__price'),
+    ('visitor_name', 'visitor__name'),
+    ('visitor_email', 'visitor__email'),
+    ('visitor_phone', 'visitor__phone'),
+    ('booked_at', 'booking_date'),
+]
+HEADER = [column for column, _ in FIELDS]
+CONTENT_TYPES = {'csv': 'text/csv; charset=utf-8', 'ndjson': 'application/x-ndjson'}
+
+
+def booking_rows(museum_id=None, date_from=None, date_to=None, chunk_size=CHUNK_SIZE):
+    """Yield one tuple per booking, in FIELDS order, ordered by visit date."""
+    bookings = Booking.objects.all()
+    if museum_id is not None:
+        bookings = bookings.filter(museum_id=museum_id)
+    if date_from is not None:
+        bookings = bookings.filter(visit_date__gte=date_from)
+    if date_to is not None:
+        bookings = bookings.filter(visit_date__lte=date_to)
+    return (
+        bookings.order_by('visit_date', 'id')
+        .values_list(*(lookup for _, lookup in FIELDS))
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def _plain(value):
+    # Dates, datetimes and Decimals become strings; everything else is already JSON/CSV friendly
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if value is None or isinstance(value, (int, str)):
+        return value
+    return str(value)
+
+
+class _Echo:
+    """File-like object whose write() hands the formatted line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(HEADER)
+    for row in rows:
+        yield writer.writerow([_plain(value) for value in row])
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(HEADER, map(_plain, row)))) + '\n'
+
+
+def lines(rows, fmt):
+    return csv_lines(rows) if fmt == 'csv' else ndjson_lines(rows)
+
+
+class _ExportRenderer(BaseRenderer):
+    """Lets DRF accept `Accept: text/csv` / `application/x-ndjson`; the body itself is streamed by the view."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode()  # Only reached for error responses
+
+
+class CSVRenderer(_ExportRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class NDJSONRenderer(_ExportRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
@@ -7,6 +7,14 @@ class BookingForm(forms.Form):
     email = forms.EmailField(label='Email')
     phone = forms.CharField(label='Phone', max_length=15)
     ticket = forms.ModelChoiceField(queryset=Ticket.objects.all(), label='Ticket Type')
+    visit_date = forms.DateField(label='Visit Date', widget=forms.DateInput(attrs={'type': 'date'}))
+    slot = forms.ChoiceField(label='Time Slot', choices=[('', 'Any time')], required=False)
+
+    def __init__(self, *args, museum=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Only the museum's own slots can be booked (see lol/inventory.py)
+        if museum is not None:
+            self.fields['slot'].choices = [('', 'Any time')] + [(slot, slot) for slot in museum.time_slots]
 
 class UserRegistrationForm(UserCreationForm):
     email = forms.EmailField(label='Email')
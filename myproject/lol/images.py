@@ -0,0 +1,85 @@
+"""
+Thumbnails for Museum.img.
+
+When a museum image is uploaded, WebP and JPEG copies at DERIVATIVE_WIDTHS
+are rendered in a small background thread pool (never on the request thread)
+and stored next to the original, e.g. images/louvre_w320.webp. Museum then
+advertises them through img_srcset_* for <picture>/srcset and the API.
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_WIDTHS = (320, 640, 960)
+FORMATS = {'webp': 'WEBP', 'jpeg': 'JPEG'}
+QUALITY = 80
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='img-derivatives')
+
+
+def derivative_name(name, width, ext):
+    stem, _ = os.path.splitext(name)
+    return f'{stem}_w{width}.{ext}'
+
+
+def srcset(name, widths, ext):
+    """srcset attribute value for the derivatives that exist, e.g. "a_w320.webp 320w, ..."."""
+    return ', '.join(
+        f'{default_storage.url(derivative_name(name, width, ext))} {width}w' for width in widths
+    )
+
+
+def render_derivatives(name):
+    """Write every derivative of the stored image `name`; returns the widths produced."""
+    with default_storage.open(name, 'rb') as source:
+        image = ImageOps.exif_transpose(Image.open(source))
+        image.load()
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    widths = []
+    for width in DERIVATIVE_WIDTHS:
+        if width > image.width and widths:
+            break  # Never upscale; the largest useful size is already written
+        target = image.copy()
+        target.thumbnail((width, width * 10), Image.LANCZOS)
+        for ext, fmt in FORMATS.items():
+            buffer = BytesIO()
+            target.save(buffer, fmt, quality=QUALITY, optimize=True)
+            path = derivative_name(name, width, ext)
+            if default_storage.exists(path):
+                default_storage.delete(path)
+            default_storage.save(path, ContentFile(buffer.getvalue()))
+        widths.append(width)
+    return widths
+
+
+def _generate(museum_id, name):
+    from . import catalogue
+    from .models import Museum
+    try:
+        widths = render_derivatives(name)
+        # .update() so no post_save fires and re-queues the job; only if the image is unchanged
+        Museum.objects.filter(pk=museum_id, img=name).update(
+            img_variants={'source': name, 'widths': widths},
+            updated_at=timezone.now(),  # update() skips auto_now; this expires the browse.html card
+        )
+        catalogue.bump_version()  # Cached listings should start using the thumbnails
+    except Exception:
+        logger.exception("Could not create derivatives for %s", name)
+    finally:
+        close_old_connections()
+
+
+def schedule_derivatives(museum):
+    """Queue thumbnail generation for a museum's current image once the save commits."""
+    museum_id, name = museum.pk, museum.img.name
+    transaction.on_commit(lambda: _executor.submit(_generate, museum_id, name))
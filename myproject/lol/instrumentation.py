@@ -0,0 +1,247 @@
+"""
+Per-request performance instrumentation.
+
+PerformanceMiddleware times every request and splits the time into database
+(query count and duration, via an execute wrapper on every connection),
+template rendering (TimedDjangoTemplates backend), serialization (building
+the response data: TimedSerializerMixin on the DRF serializers and
+@timed_serialization on hand-written shaping functions) and DRF response
+rendering, i.e. JSON encoding (TimedJSONRenderer). Each response gets a Server-Timing header, and the last
+PERF_STATS_WINDOW samples per URL name are kept in memory so
+`api/perf/stats/` can report p50/p95/p99 for this process.
+
+The hooks only read a context variable when no request is being measured, so
+management commands and background threads pay nothing.
+"""
+import functools
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.backends.django import DjangoTemplates, Template
+from rest_framework.renderers import JSONRenderer
+
+METRICS = ('total', 'db', 'template', 'serialize', 'render')
+_current = ContextVar('lol_request_timing', default=None)
+
+
+class RequestTiming:
+    __slots__ = ('queries', 'db', 'template', 'serialize', 'render', 'serializing')
+
+    def __init__(self):
+        self.queries = 0
+        self.db = self.template = self.serialize = self.render = 0.0  # Seconds
+        self.serializing = False  # Inside a timed serializer, so nested ones aren't counted twice
+
+
+# --- Hooks --------------------------------------------------------------
+
+def _db_wrapper(execute, sql, params, many, context):
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.db += time.perf_counter() - start
+        timing.queries += 1
+
+
+def _install_db_wrapper(connection, **kwargs):
+    # Connections are per thread (and sync_to_async runs queries on other threads),
+    # so the wrapper goes on every connection rather than around the request
+    if _db_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_db_wrapper)
+
+
+connection_created.connect(_install_db_wrapper)
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        timing = _current.get()
+        if timing is None:
+            return super().render(context, request)
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timing.template += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, with render time added to the current request's timing."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
+
+
+def _serialize(build):
+    timing = _current.get()
+    if timing is None or timing.serializing:
+        return build()
+    timing.serializing = True
+    start, db = time.perf_counter(), timing.db
+    try:
+        return build()
+    finally:
+        # Queries run while serializing (a lazy queryset, related objects) are db time
+        timing.serialize += time.perf_counter() - start - (timing.db - db)
+        timing.serializing = False
+
+
+def timed_serialization(func):
+    """Add a response-shaping function's run time to the current request's serialize time."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return _serialize(lambda: func(*args, **kwargs))
+
+    return wrapper
+
+
+class TimedSerializerMixin:
+    """
+    For DRF serializers: add to_representation() time to the current request's
+    serialize time. With many=True each item is timed; nested serializers
+    count towards their parent only.
+    """
+
+    def to_representation(self, instance):
+        return _serialize(lambda: super(TimedSerializerMixin, self).to_representation(instance))
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """DRF's JSONRenderer, with encode time added to the current request's render time."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        timing = _current.get()
+        if timing is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        start = time.perf_counter()
+        try:
+            return super().render(data, accepted_media_type, renderer_context)
+        finally:
+            timing.render += time.perf_counter() - start
+
+
+# --- Rolling stats ------------------------------------------------------
+
+class Stats:
+    """Last `window` samples of each metric per URL name, for percentile reporting."""
+
+    def __init__(self, window):
+        self.window = window
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, timing, total):
+        # Under the lock: threaded servers record concurrently, `count += 1` is not
+        # atomic and snapshot() must not copy a deque while it is being appended to
+        with self._lock:
+            entry = self._views.get(name)
+            if entry is None:
+                entry = self._views[name] = {
+                    'count': 0,
+                    'queries': deque(maxlen=self.window),
+                    **{metric: deque(maxlen=self.window) for metric in METRICS},
+                }
+            entry['count'] += 1
+            entry['queries'].append(timing.queries)
+            entry['total'].append(total)
+            entry['db'].append(timing.db)
+            entry['template'].append(timing.template)
+            entry['serialize'].append(timing.serialize)
+            entry['render'].append(timing.render)
+
+    def reset(self):
+        with self._lock:
+            self._views = {}
+
+    @staticmethod
+    def _percentiles(samples, scale=1.0, digits=2):
+        ordered = sorted(samples)
+        if not ordered:
+            return {}
+        pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * scale, digits)
+        return {'p50': pick(0.50), 'p95': pick(0.95), 'p99': pick(0.99), 'max': round(ordered[-1] * scale, digits)}
+
+    def snapshot(self):
+        with self._lock:
+            copies = {
+                name: {key: entry[key] if key == 'count' else list(entry[key]) for key in entry}
+                for name, entry in self._views.items()
+            }
+        views = {}
+        for name, entry in sorted(copies.items()):
+            views[name] = {
+                'count': entry['count'],
+                'samples': len(entry['total']),
+                'queries': self._percentiles(entry['queries'], digits=None),
+                **{f'{metric}_ms': self._percentiles(entry[metric], 1000) for metric in METRICS},
+            }
+        return {'pid': os.getpid(), 'window': self.window, 'views': views}
+
+
+stats = Stats(getattr(settings, 'PERF_STATS_WINDOW', 1000))
+
+
+# --- Middleware ---------------------------------------------------------
+
+class PerformanceMiddleware:
+    """Time each request, add a Server-Timing header and feed the rolling stats."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        # Connections opened before this module was imported
+        for connection in connections.all(initialized_only=True):
+            _install_db_wrapper(connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timing = RequestTiming()
+        token = _current.set(timing)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timing, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        timing = RequestTiming()
+        token = _current.set(timing)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timing, time.perf_counter() - start)
+
+    def finish(self, request, response, timing, total):
+        match = getattr(request, 'resolver_match', None)
+        stats.record(match.view_name if match else '<unresolved>', timing, total)
+        response['Server-Timing'] = (
+            f'total;dur={total * 1000:.1f}, '
+            f'db;dur={timing.db * 1000:.1f};desc="{timing.queries} queries", '
+            f'template;dur={timing.template * 1000:.1f}, '
+            f'serialize;dur={timing.serialize * 1000:.1f}, '
+            f'render;dur={timing.render * 1000:.1f}'
+        )
+        return response
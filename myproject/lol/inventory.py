@@ -0,0 +1,158 @@
+"""
+Ticket inventory per museum and day (SlotInventory).
+
+The row with slot '' is the day's total and is a hard cap: every booking
+takes from it. A booking for a time slot also takes from that slot's row, so
+a slot can never sell more than Museum.slot_capacity and the slots together
+can never sell more than daily_capacity. Only slots listed in
+Museum.time_slots are accepted.
+
+Rows are created on first use, starting from the tickets already booked for
+that day/slot; rebuild() recomputes them all from Booking for backfills.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from .models import Booking, SlotInventory
+
+DAY = ''  # Slot of the per-day total row
+REBUILD_BATCH_SIZE = 2000
+
+
+class SoldOut(Exception):
+    """Raised when a museum has no capacity left for the requested day/slot."""
+
+
+class UnknownSlot(Exception):
+    """Raised for a time slot that is not in the museum's time_slots."""
+
+
+def check_slot(museum, slot):
+    if slot and slot not in museum.time_slots:
+        offered = ', '.join(museum.time_slots) or "none"
+        raise UnknownSlot(f"{museum.name} has no '{slot}' time slot (available: {offered})")
+
+
+def _capacity(museum, slot):
+    return museum.slot_capacity if slot else museum.daily_capacity
+
+
+def _booked(museum_id, visit_date, slot):
+    bookings = Booking.objects.filter(museum_id=museum_id, visit_date=visit_date)
+    if slot:
+        bookings = bookings.filter(slot=slot)
+    return bookings.aggregate(total=Sum('quantity'))['total'] or 0
+
+
+def get_inventory(museum, visit_date, slot=DAY):
+    """Return the inventory row for a museum/day/slot, creating it on first use."""
+    try:
+        return SlotInventory.objects.get(museum=museum, visit_date=visit_date, slot=slot)
+    except SlotInventory.DoesNotExist:
+        pass
+    capacity = _capacity(museum, slot)
+    try:
+        # Savepoint so a lost creation race doesn't break the caller's transaction
+        with transaction.atomic():
+            return SlotInventory.objects.create(
+                museum=museum,
+                visit_date=visit_date,
+                slot=slot,
+                capacity=capacity,
+                # Bookings made before the row existed (imports, seed_data, older code) still count
+                remaining=max(0, capacity - _booked(museum.pk, visit_date, slot)),
+            )
+    except IntegrityError:
+        # Another request created the row first
+        return SlotInventory.objects.get(museum=museum, visit_date=visit_date, slot=slot)
+
+
+def reserve(museum, visit_date, slot=DAY, quantity=1):
+    """
+    Atomically take `quantity` tickets from the day's total and, for a time
+    slot, from that slot too. Each row is a single conditional UPDATE, so
+    there is no read-then-write window; the day row is always taken first so
+    concurrent bookings lock rows in the same order.
+    Call this inside the same transaction that creates the Booking rows.
+    """
+    check_slot(museum, slot)
+    rows = [DAY, slot] if slot else [DAY]
+    # Savepoint: a sold-out slot must not leave the day's tickets taken
+    with transaction.atomic():
+        for row_slot in rows:
+            inventory = get_inventory(museum, visit_date, row_slot)
+            updated = SlotInventory.objects.filter(
+                pk=inventory.pk,
+                remaining__gte=quantity,
+            ).update(remaining=F('remaining') - quantity)
+            if not updated:
+                when = f"{visit_date} {row_slot}" if row_slot else f"{visit_date}"
+                raise SoldOut(f"{museum.name} is sold out for {when}")
+    return inventory
+
+
+def release(museum_id, visit_date, slot=DAY, quantity=1):
+    """Give tickets back to the inventory, e.g. when a booking is cancelled."""
+    SlotInventory.objects.filter(
+        museum_id=museum_id,
+        visit_date=visit_date,
+        slot__in=[DAY, slot] if slot else [DAY],
+        remaining__lte=F('capacity') - quantity,
+    ).update(remaining=F('remaining') + quantity)
+
+
+def release_many(bookings):
+    """release() for several bookings, e.g. a bulk delete in the admin."""
+    for booking in bookings:
+        release(booking.museum_id, booking.visit_date, booking.slot, booking.quantity)
+
+
+def remaining_capacity(museum, visit_date, slot=DAY):
+    """Tickets still available for a day (and slot): the lower of the day's and the slot's remaining."""
+    wanted = [DAY, slot] if slot else [DAY]
+    rows = dict(
+        SlotInventory.objects.filter(museum=museum, visit_date=visit_date, slot__in=wanted)
+        .values_list('slot', 'remaining')
+    )
+    return min(
+        rows[row_slot] if row_slot in rows
+        else max(0, _capacity(museum, row_slot) - _booked(museum.pk, visit_date, row_slot))
+        for row_slot in wanted
+    )
+
+
+def rebuild(museum_id=None):
+    """
+    Recompute `remaining` of existing inventory rows from the Booking table,
+    for one museum or all of them, and reset `capacity` from the museum. Use
+    after bulk imports or admin edits that bypassed reserve()/release().
+    Returns the number of rows updated.
+    """
+    rows = SlotInventory.objects.select_related('museum').order_by('pk')
+    bookings = Booking.objects.order_by()
+    if museum_id is not None:
+        rows = rows.filter(museum_id=museum_id)
+        bookings = bookings.filter(museum_id=museum_id)
+    days = {
+        (row['museum_id'], row['visit_date']): row['total']
+        for row in bookings.values('museum_id', 'visit_date').annotate(total=Sum('quantity'))
+    }
+    slots = {
+        (row['museum_id'], row['visit_date'], row['slot']): row['total']
+        for row in bookings.exclude(slot=DAY).values('museum_id', 'visit_date', 'slot').annotate(total=Sum('quantity'))
+    }
+    updated = 0
+    with transaction.atomic():
+        batch = []
+        for row in rows.iterator(chunk_size=REBUILD_BATCH_SIZE):
+            if row.slot:
+                booked = slots.get((row.museum_id, row.visit_date, row.slot), 0)
+            else:
+                booked = days.get((row.museum_id, row.visit_date), 0)
+            row.capacity = _capacity(row.museum, row.slot)
+            row.remaining = max(0, row.capacity - booked)
+            batch.append(row)
+            if len(batch) == REBUILD_BATCH_SIZE:
+                updated += SlotInventory.objects.bulk_update(batch, ['capacity', 'remaining'])
+                batch = []
+        updated += SlotInventory.objects.bulk_update(batch, ['capacity', 'remaining'])
+    return updated
@@ -0,0 +1,123 @@
+import asyncio
+import importlib.util
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from lol.models import Visitor
+from lol.token_manager import get_tokens_for_user
+
+# (label, uvicorn --interface, application); the WSGI server can only run the sync views
+SERVERS = [
+    ('wsgi', 'wsgi', 'myproject.wsgi:application'),
+    ('asgi', 'asgi3', 'myproject.asgi:application'),
+]
+ROUTES = [
+    ('browse', 'browse_museums_api', 'async_browse_museums_api'),
+    ('my_bookings', 'user_bookings_api', 'async_user_bookings_api'),
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the chatbot APIs under uvicorn as a WSGI app (sync views) and as an ASGI app "
+        "(sync and async views) against the current database, and report req/s and p50/p95/p99. "
+        "Needs uvicorn (`pip install uvicorn`)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=5000, help="Requests per route and server")
+        parser.add_argument('--concurrency', type=int, default=500, help="Concurrent clients (requests in flight)")
+        parser.add_argument('--workers', type=int, default=1, help="uvicorn worker processes per server")
+
+    def handle(self, *args, **options):
+        if importlib.util.find_spec('uvicorn') is None:
+            raise CommandError("uvicorn is not installed; run `pip install uvicorn`.")
+        visitor = Visitor.objects.filter(user__isnull=False, bookings__isnull=False).select_related('user').first()
+        if visitor is None:
+            raise CommandError("No user with bookings found; run `manage.py seed_data` first.")
+        self.token = get_tokens_for_user(visitor.user)['access']
+        self.requests = options['requests']
+        self.concurrency = options['concurrency']
+
+        self.stdout.write(f"{'server':<7}{'view':<8}{'route':<14}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        for label, interface, app in SERVERS:
+            port = free_port()
+            server = self.start(app, interface, port, options['workers'])
+            try:
+                for name, sync_route, async_route in ROUTES:
+                    variants = [('sync', sync_route)]
+                    if interface == 'asgi3':
+                        variants.append(('async', async_route))
+                    for kind, route in variants:
+                        rate, p50, p95, p99, errors = asyncio.run(self.load(port, reverse(route)))
+                        self.stdout.write(
+                            f"{label:<7}{kind:<8}{name:<14}{rate:>9.0f}{p50:>9.1f}{p95:>9.1f}{p99:>9.1f}{errors:>8}"
+                        )
+            finally:
+                server.terminate()
+                server.wait()
+
+    def start(self, app, interface, port, workers):
+        server = subprocess.Popen(
+            [
+                sys.executable, '-m', 'uvicorn', app, '--interface', interface,
+                '--port', str(port), '--workers', str(workers), '--log-level', 'warning', '--no-access-log',
+            ],
+            cwd=settings.BASE_DIR, env=dict(os.environ),
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"uvicorn exited with status {server.returncode} serving {app}.")
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+                return server
+            except OSError:
+                time.sleep(0.1)
+        server.terminate()
+        raise CommandError(f"uvicorn did not start serving {app} within 30s.")
+
+    async def load(self, port, path):
+        import httpx
+
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        headers = {'Host': 'localhost', 'Authorization': f'Bearer {self.token}'}
+        latencies = []
+        errors = 0
+        remaining = iter(range(self.requests))
+
+        async with httpx.AsyncClient(base_url=f'http://127.0.0.1:{port}', headers=headers, limits=limits) as client:
+            # Warm-up: imports, URL resolver and the catalogue cache
+            await client.get(path)
+
+            async def worker():
+                nonlocal errors
+                for _ in remaining:
+                    start = time.perf_counter()
+                    try:
+                        response = await client.get(path, timeout=30)
+                        if response.status_code != 200:
+                            errors += 1
+                    except httpx.HTTPError:
+                        errors += 1
+                    latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+            elapsed = time.perf_counter() - start
+
+        ordered = sorted(latencies)
+        pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+        return len(ordered) / elapsed, statistics.median(ordered) * 1000, pick(0.95), pick(0.99), errors
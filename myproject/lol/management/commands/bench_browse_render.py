@@ -0,0 +1,40 @@
+import time
+from datetime import datetime, timezone
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from lol.models import Museum
+
+
+class Command(BaseCommand):
+    help = "Time browse.html rendering for N in-memory museums with cold and warm fragment caches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--museums', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        updated_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        museums = [
+            Museum(id=i, name=f"Museum {i}", location=f"City {i % 50}", updated_at=updated_at)
+            for i in range(1, options['museums'] + 1)
+        ]
+        request = RequestFactory().get('/lol/browse/')
+        request.user = AnonymousUser()
+
+        def render():
+            start = time.perf_counter()
+            render_to_string('lol/browse.html', {'museums': museums}, request=request)
+            return (time.perf_counter() - start) * 1000
+
+        cold = []
+        for _ in range(options['repeat']):
+            cache.clear()
+            cold.append(render())
+        warm = [render() for _ in range(options['repeat'])]
+
+        self.stdout.write(f"{len(museums)} museums, best of {options['repeat']}:")
+        self.stdout.write(f"  cold fragment cache (every card rendered): {min(cold):.1f} ms/page")
+        self.stdout.write(f"  warm fragment cache (cards from cache):    {min(warm):.1f} ms/page")
@@ -0,0 +1,54 @@
+import statistics
+import time
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+from lol.token_manager import get_tokens_for_user
+
+MIDDLEWARE_PATH = 'lol.instrumentation.PerformanceMiddleware'
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-request overhead of PerformanceMiddleware by timing the same requests "
+        "with it enabled and removed, interleaved. Uses the current database (see seed_data)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help="Requests per path and variant")
+
+    def handle(self, *args, **options):
+        if MIDDLEWARE_PATH not in settings.MIDDLEWARE:
+            raise CommandError(f"{MIDDLEWARE_PATH} is not in MIDDLEWARE.")
+        user = User.objects.filter(visitor__bookings__isnull=False).first() or User.objects.first()
+        if user is None:
+            raise CommandError("No users found; run `manage.py seed_data` first.")
+        headers = {'HTTP_HOST': 'localhost', 'HTTP_AUTHORIZATION': f"Bearer {get_tokens_for_user(user)['access']}"}
+
+        # Clients build their middleware chain on creation, so each variant gets its own
+        on = Client(**headers)
+        on.force_login(user)
+        with override_settings(MIDDLEWARE=[m for m in settings.MIDDLEWARE if m != MIDDLEWARE_PATH]):
+            off = Client(**headers)
+            off.force_login(user)
+            off.get('/')  # Builds the handler while the override is active
+
+        paths = [reverse('browse_museums_api'), reverse('user_bookings_api'), reverse('browse'), '/contact/']
+        self.stdout.write(f"{'path':<28}{'off ms':>9}{'on ms':>9}{'overhead us':>13}")
+        overheads = []
+        for path in paths:
+            on.get(path)
+            off.get(path)
+            timings = {'on': [], 'off': []}
+            for _ in range(options['requests']):
+                for name, client in (('off', off), ('on', on)):
+                    start = time.perf_counter()
+                    client.get(path)
+                    timings[name].append(time.perf_counter() - start)
+            off_ms = statistics.median(timings['off']) * 1000
+            on_ms = statistics.median(timings['on']) * 1000
+            overheads.append(on_ms - off_ms)
+            self.stdout.write(f"{path:<28}{off_ms:>9.3f}{on_ms:>9.3f}{(on_ms - off_ms) * 1000:>13.1f}")
+        self.stdout.write(f"median overhead: {statistics.median(overheads) * 1000:.1f} us/request")
@@ -0,0 +1,58 @@
+import json
+import os
+import subprocess
+import sys
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Runs in a fresh interpreter per profile so startup cost is measured from scratch
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+from django.test import Client
+from django.urls import resolve
+resolve('/')  # Import the URLconf, part of real startup
+startup = time.perf_counter() - start
+client = Client(HTTP_HOST='localhost')
+path, requests = sys.argv[1], int(sys.argv[2])
+assert client.get(path).status_code == 200  # Warm-up (first template parse, URL cache)
+start = time.perf_counter()
+for _ in range(requests):
+    client.get(path)
+per_request = (time.perf_counter() - start) / requests
+print(json.dumps({'startup_ms': startup * 1000, 'per_request_ms': per_request * 1000}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Compare startup time and per-request overhead of the dev and prod settings profiles."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/contact/', help="Page to request (should not need the DB)")
+        parser.add_argument('--requests', type=int, default=500)
+
+    def handle(self, *args, **options):
+        results = {}
+        for profile in ('dev', 'prod'):
+            env = dict(os.environ, DJANGO_ENV=profile, DJANGO_SETTINGS_MODULE='myproject.settings')
+            env.pop('DJANGO_DEBUG', None)
+            env.setdefault('DJANGO_SECRET_KEY', 'bench-settings-profiles-only')  # prod refuses to start without one
+            if profile == 'prod':
+                # The manifest static storage needs collected files to resolve {% static %}
+                subprocess.run(
+                    [sys.executable, 'manage.py', 'collectstatic', '--noinput', '-v0'],
+                    cwd=settings.BASE_DIR, env=env, check=True,
+                )
+            output = subprocess.run(
+                [sys.executable, '-c', PROBE, options['path'], str(options['requests'])],
+                cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+            ).stdout
+            results[profile] = json.loads(output.strip().splitlines()[-1])
+
+        self.stdout.write(f"{'profile':<8}{'startup':>12}{'per request':>16}")
+        for profile, numbers in results.items():
+            self.stdout.write(
+                f"{profile:<8}{numbers['startup_ms']:>10.1f}ms{numbers['per_request_ms']:>14.3f}ms"
+            )
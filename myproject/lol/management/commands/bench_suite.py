@@ -0,0 +1,161 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import django
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from lol.models import Booking, Exhibit, Museum, Visitor
+from lol.token_manager import get_tokens_for_user
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the main lol views through the test client against the current database "
+        "(fill it with seed_data first) and record wall time, queries and peak memory as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help="Timed requests per scenario")
+        parser.add_argument('--cold', action='store_true', help="Clear the cache before every request")
+        parser.add_argument('--output', help="Write the results to this JSON file")
+        parser.add_argument('--compare', help="Baseline JSON file to print deltas against")
+
+    def handle(self, *args, **options):
+        visitor = (
+            Visitor.objects.filter(user__isnull=False, bookings__isnull=False)
+            .select_related('user').order_by('pk').first()
+        )
+        if visitor is None:
+            raise CommandError("No user with bookings found; run `manage.py seed_data` first.")
+        user = visitor.user
+        booked = set(Booking.objects.filter(visitor=visitor).values_list('museum_id', flat=True))
+        free_museum = Museum.objects.exclude(pk__in=booked).order_by('pk').values_list('pk', flat=True).first()
+        if free_museum is None:
+            raise CommandError("The benchmark user has booked every museum; nothing left to book.")
+
+        self.repeat = options['repeat']
+        self.cold = options['cold']
+        self.browser = Client(HTTP_HOST='localhost')
+        self.browser.force_login(user)
+        access = get_tokens_for_user(user)['access']
+        self.api = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        results = {
+            'browse': self.measure(lambda: self.browser.get(reverse('browse'))),
+            'browse_museums_api': self.measure(lambda: self.api.get(reverse('browse_museums_api'))),
+            'user_bookings_api': self.measure(lambda: self.api.get(reverse('user_bookings_api'))),
+        }
+        # Book and cancel alternate so every booking request starts from the same state
+        pending = []
+
+        def book():
+            response = self.api.post(reverse('book_museum_api', args=[free_museum]))
+            assert response.status_code == 201, response.content
+            pending.append(response.json()['booking_id'])
+            return response
+
+        def cancel():
+            response = self.api.post(reverse('cancel_booking_api', args=[pending.pop()]))
+            assert response.status_code == 200, response.content
+            return response
+
+        results['book_museum_api'], results['cancel_booking_api'] = self.measure_pair(book, cancel)
+
+        report = {
+            'meta': {
+                'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'repeat': self.repeat,
+                'cold_cache': self.cold,
+                'rows': {
+                    'museums': Museum.objects.count(),
+                    'exhibits': Exhibit.objects.count(),
+                    'visitors': Visitor.objects.count(),
+                    'bookings': Booking.objects.count(),
+                },
+                'user_bookings': len(booked),
+            },
+            'results': results,
+        }
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)['results']
+        self.print_report(results, baseline)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+
+    def run_once(self, call):
+        if self.cold:
+            cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = call()
+            elapsed = (time.perf_counter() - start) * 1000
+        assert response.status_code < 400, f"{response.status_code}: {response.content[:200]!r}"
+        return elapsed, len(queries), len(response.content)
+
+    def peak_memory(self, call):
+        if self.cold:
+            cache.clear()
+        tracemalloc.start()
+        try:
+            call()
+            return tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+
+    def summarise(self, samples, peak_kib):
+        times = sorted(sample[0] for sample in samples)
+        return {
+            'wall_ms': {
+                'min': round(times[0], 2),
+                'median': round(statistics.median(times), 2),
+                'p95': round(times[min(len(times) - 1, int(len(times) * 0.95))], 2),
+                'max': round(times[-1], 2),
+            },
+            'queries': samples[-1][1],
+            'response_bytes': samples[-1][2],
+            'peak_memory_kib': round(peak_kib, 1),
+        }
+
+    def measure(self, call):
+        self.run_once(call)  # Warm-up: imports, template parsing, first cache fill
+        samples = [self.run_once(call) for _ in range(self.repeat)]
+        # tracemalloc slows everything down, so memory gets its own untimed request
+        return self.summarise(samples, self.peak_memory(call))
+
+    def measure_pair(self, first, second):
+        self.run_once(first)
+        self.run_once(second)
+        first_samples, second_samples = [], []
+        for _ in range(self.repeat):
+            first_samples.append(self.run_once(first))
+            second_samples.append(self.run_once(second))
+        first_peak = self.peak_memory(first)
+        second_peak = self.peak_memory(second)
+        return self.summarise(first_samples, first_peak), self.summarise(second_samples, second_peak)
+
+    def print_report(self, results, baseline):
+        self.stdout.write(f"{'scenario':<22}{'median ms':>11}{'p95 ms':>10}{'queries':>9}{'peak KiB':>11}")
+        for name, result in results.items():
+            line = (
+                f"{name:<22}{result['wall_ms']['median']:>11.2f}{result['wall_ms']['p95']:>10.2f}"
+                f"{result['queries']:>9}{result['peak_memory_kib']:>11.1f}"
+            )
+            if baseline and name in baseline:
+                before = baseline[name]
+                change = (result['wall_ms']['median'] / before['wall_ms']['median'] - 1) * 100
+                line += f"   {change:+.1f}% median, {result['queries'] - before['queries']:+d} queries"
+            self.stdout.write(line)
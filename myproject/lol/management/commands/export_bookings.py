@@ -0,0 +1,29 @@
+import sys
+from datetime import date
+from django.core.management.base import BaseCommand
+from lol import exports
+
+
+class Command(BaseCommand):
+    help = "Stream bookings (with visitor, ticket and museum) as CSV or NDJSON, optionally for one museum and date range."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--museum', type=int, dest='museum_id', help="Museum id")
+        parser.add_argument('--from', type=date.fromisoformat, dest='date_from', help="First visit date, YYYY-MM-DD")
+        parser.add_argument('--to', type=date.fromisoformat, dest='date_to', help="Last visit date, YYYY-MM-DD")
+        parser.add_argument('--format', choices=sorted(exports.CONTENT_TYPES), default='csv')
+        parser.add_argument('--chunk-size', type=int, default=exports.CHUNK_SIZE)
+        parser.add_argument('--output', help="File to write (default: stdout)")
+
+    def handle(self, *args, **options):
+        rows = exports.booking_rows(
+            museum_id=options['museum_id'],
+            date_from=options['date_from'],
+            date_to=options['date_to'],
+            chunk_size=options['chunk_size'],
+        )
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as f:
+                f.writelines(exports.lines(rows, options['format']))
+        else:
+            sys.stdout.writelines(exports.lines(rows, options['format']))
@@ -0,0 +1,208 @@
+import csv
+import json
+import time
+from itertools import islice
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+from lol import catalogue, search
+from lol.models import Exhibit, Museum, Ticket
+
+# Columns accepted per kind: (column, model field, required)
+COLUMNS = {
+    'museums': [('name', 'name', True), ('location', 'location', True), ('daily_capacity', 'daily_capacity', False)],
+    'exhibits': [('name', 'name', True), ('description', 'description', False)],
+    'tickets': [('id', 'id', False), ('price', 'price', True)],
+}
+MAX_REPORTED_ERRORS = 20
+
+
+def read_rows(path, fmt):
+    """Yield (line number, row dict) from a CSV (with header) or NDJSON file, one row at a time."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        if fmt == 'csv':
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for lineno, line in enumerate(f, start=1):
+                if line.strip():
+                    try:
+                        yield lineno, json.loads(line)
+                    except ValueError:
+                        yield lineno, None
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream museums, exhibits or tickets from a CSV or NDJSON file into the database in batches. "
+        "Museums are matched by name, exhibits by (museum, name) and tickets by id; matches are updated, "
+        "everything else is created. Exhibits reference their museum by `museum` (name) or `museum_id`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(COLUMNS))
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help="Default: from the file extension")
+        parser.add_argument('--batch-size', type=int, default=2000, help="Rows per transaction")
+        parser.add_argument('--dry-run', action='store_true', help="Validate only, write nothing")
+
+    def handle(self, *args, **options):
+        kind, path = options['kind'], options['path']
+        fmt = options['format'] or ('ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv')
+        self.model = {'museums': Museum, 'exhibits': Exhibit, 'tickets': Ticket}[kind]
+        self.columns = COLUMNS[kind]
+        self.dry_run = options['dry_run']
+        self.created = self.updated = self.invalid = self.valid = 0
+        self.museum_ids = {}
+        if kind in ('museums', 'exhibits'):
+            # Names resolve to the oldest museum with that name
+            for pk, name in Museum.objects.order_by('-pk').values_list('pk', 'name').iterator():
+                self.museum_ids[name] = pk
+        self.known_museums = set(self.museum_ids.values())
+
+        start = time.perf_counter()
+        try:
+            rows = self.validate(read_rows(path, fmt))
+            for chunk in chunks(rows, options['batch_size']):
+                self.valid += len(chunk)
+                if not self.dry_run:
+                    with transaction.atomic():
+                        getattr(self, f'write_{kind}')(chunk)
+                self.stdout.write(f"\r  {self.valid} rows processed", ending='')
+                self.stdout.flush()
+        except OSError as e:
+            raise CommandError(e)
+        elapsed = time.perf_counter() - start
+
+        if self.created or self.updated:
+            if kind in ('museums', 'exhibits'):
+                # bulk_create/bulk_update skip the post_save receivers in lol/signals.py
+                catalogue.bump_version()
+            if kind == 'museums':
+                catalogue.bump_version(search.VERSION_KEY)
+
+        total = self.valid + self.invalid
+        rate = total / elapsed if elapsed else 0
+        written = f"{self.valid} valid (dry run)" if self.dry_run else f"{self.created} created, {self.updated} updated"
+        self.stdout.write(f"\r{kind}: {written}, {self.invalid} invalid in {elapsed:.1f}s ({rate:,.0f} rows/s)")
+        if (self.created or self.updated) and kind != 'tickets' and catalogue.is_process_local():
+            self.stderr.write(self.style.WARNING(catalogue.PROCESS_LOCAL_WARNING))
+
+    def validate(self, rows):
+        """Clean every row with the model fields' own validation; report and skip bad rows."""
+        fields = {name: self.model._meta.get_field(name) for _, name, _ in self.columns}
+        for lineno, row in rows:
+            if not isinstance(row, dict):
+                self.report(lineno, "not a JSON object")
+                continue
+            try:
+                cleaned = {}
+                for column, name, required in self.columns:
+                    value = row.get(column)
+                    if value in (None, ''):
+                        if required:
+                            raise ValidationError(f"missing {column}")
+                        continue
+                    if isinstance(value, str):
+                        value = value.strip()
+                    cleaned[name] = fields[name].clean(value, None)
+                if self.model is Exhibit:
+                    cleaned['museum_id'] = self.resolve_museum(row)
+            except ValidationError as e:
+                self.report(lineno, '; '.join(e.messages))
+                continue
+            yield cleaned
+
+    def resolve_museum(self, row):
+        if row.get('museum_id') not in (None, ''):
+            try:
+                museum_id = int(row['museum_id'])
+            except (TypeError, ValueError):
+                raise ValidationError(f"invalid museum_id {row['museum_id']!r}")
+            if museum_id not in self.known_museums:
+                raise ValidationError(f"unknown museum_id {museum_id}")
+            return museum_id
+        name = (row.get('museum') or '').strip()
+        if name not in self.museum_ids:
+            raise ValidationError(f"unknown museum {name!r}")
+        return self.museum_ids[name]
+
+    def report(self, lineno, message):
+        self.invalid += 1
+        if self.invalid <= MAX_REPORTED_ERRORS:
+            self.stderr.write(f"\rline {lineno}: {message}")
+        elif self.invalid == MAX_REPORTED_ERRORS + 1:
+            self.stderr.write("\rfurther invalid rows are counted but not printed")
+
+    def upsert(self, new, existing, fields):
+        """Write one chunk: bulk_create the new instances, bulk_update the matched ones."""
+        if new:
+            self.model.objects.bulk_create(new)
+            self.created += len(new)
+        if existing:
+            self.model.objects.bulk_update(existing, fields)
+            self.updated += len(existing)
+        return new
+
+    def write_museums(self, chunk):
+        by_name = {}
+        for row in chunk:
+            by_name[row['name']] = row  # Last row wins within a chunk
+        new, with_capacity, without_capacity = [], [], []
+        now = timezone.now()
+        for name, row in by_name.items():
+            if name not in self.museum_ids:
+                new.append(Museum(**row))
+            elif 'daily_capacity' in row:
+                with_capacity.append(Museum(pk=self.museum_ids[name], updated_at=now, **row))
+            else:
+                # No capacity column: keep the stored one
+                without_capacity.append(Museum(pk=self.museum_ids[name], updated_at=now, **row))
+        for museum in self.upsert(new, with_capacity, ['location', 'daily_capacity', 'updated_at']):
+            self.museum_ids[museum.name] = museum.pk
+            self.known_museums.add(museum.pk)
+        self.upsert([], without_capacity, ['location', 'updated_at'])
+
+    def write_exhibits(self, chunk):
+        by_key = {(row['museum_id'], row['name']): row for row in chunk}
+        # Only this chunk's candidates are looked up, so memory stays flat however big the file is
+        matches = {
+            (museum_id, name): pk
+            for pk, museum_id, name in Exhibit.objects.filter(
+                museum_id__in={key[0] for key in by_key}, name__in={key[1] for key in by_key}
+            ).values_list('pk', 'museum_id', 'name')
+        }
+        new, existing = [], []
+        now = timezone.now()
+        for key, row in by_key.items():
+            row.setdefault('description', '')
+            if key in matches:
+                existing.append(Exhibit(pk=matches[key], updated_at=now, **row))
+            else:
+                new.append(Exhibit(**row))
+        self.upsert(new, existing, ['description', 'updated_at'])
+        # bulk writes skip the Exhibit signals, which re-key each museum's cached exhibit list
+        catalogue.touch_museums({key[0] for key in by_key})
+
+    def write_tickets(self, chunk):
+        ids = {row['id'] for row in chunk if 'id' in row}
+        known = set(Ticket.objects.filter(pk__in=ids).values_list('pk', flat=True))
+        new, existing = [], []
+        for row in chunk:
+            (existing if row.get('id') in known else new).append(Ticket(**row))
+        self.upsert(new, existing, ['price'])
+        if any(ticket.pk is not None for ticket in new):
+            # Inserting explicit ids doesn't advance the id sequence (PostgreSQL), so the
+            # next Ticket.objects.create() would collide with an imported id
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(no_style(), [Ticket]):
+                    cursor.execute(sql)
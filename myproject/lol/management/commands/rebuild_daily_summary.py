@@ -0,0 +1,15 @@
+import time
+from django.core.management.base import BaseCommand
+from lol import occupancy
+
+
+class Command(BaseCommand):
+    help = "Recompute the DailySummary table (bookings, tickets, revenue per museum and day) from Booking."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--museum', type=int, dest='museum_id', help="Only rebuild this museum")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        rows = occupancy.rebuild(options['museum_id'])
+        self.stdout.write(f"Rebuilt {rows} daily summaries in {time.perf_counter() - start:.1f}s")
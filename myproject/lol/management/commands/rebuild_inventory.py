@@ -0,0 +1,15 @@
+import time
+from django.core.management.base import BaseCommand
+from lol import inventory
+
+
+class Command(BaseCommand):
+    help = "Recompute SlotInventory capacity and remaining tickets per museum, day and slot from Booking."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--museum', type=int, dest='museum_id', help="Only rebuild this museum")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        rows = inventory.rebuild(options['museum_id'])
+        self.stdout.write(f"Rebuilt {rows} inventory rows in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,153 @@
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from lol import catalogue, inventory, occupancy, search
+from lol.models import Booking, Exhibit, Museum, Ticket, Visitor
+
+CITIES = [
+    'Lahore', 'Karachi', 'Islamabad', 'Peshawar', 'Multan', 'Quetta', 'London', 'Paris',
+    'Berlin', 'Madrid', 'Rome', 'Cairo', 'Istanbul', 'Tokyo', 'Delhi', 'New York',
+]
+KINDS = ['Museum', 'Gallery', 'Heritage Centre', 'Science Museum', 'Fort', 'Archive']
+TOPICS = ['Bronze', 'Textiles', 'Manuscripts', 'Coins', 'Ceramics', 'Fossils', 'Weapons', 'Paintings', 'Maps', 'Jewellery']
+TIME_SLOTS = ['10:00', '12:00', '14:00', '16:00']
+SLOTS = ['', ''] + TIME_SLOTS  # Booking slots; '' is "any time"
+TICKET_PRICES = ['0.00', '5.00', '10.00', '25.00']
+PASSWORD = 'bench-password'
+
+
+def chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with synthetic museums, exhibits, users and bookings for benchmarking. "
+        "Rows are bulk-inserted, so signals do not fire; caches are invalidated once at the end. "
+        "Every generated user has the password '%s'." % PASSWORD
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--museums', type=int, default=5000)
+        parser.add_argument('--exhibits', type=int, default=100000)
+        parser.add_argument('--users', type=int, default=200000)
+        parser.add_argument('--bookings', type=int, default=1000000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42, help="Random seed, so runs are repeatable")
+        parser.add_argument('--prefix', default='bench', help="Username prefix for generated users")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        if options['bookings'] and not (options['users'] and options['museums']):
+            raise CommandError("Bookings need at least one user and one museum.")
+        if options['bookings'] > options['users'] * options['museums']:
+            raise CommandError("At most one booking per user per museum: --bookings must be <= users * museums.")
+
+        tickets = self.tickets()
+        museum_ids = self.step("museums", options['museums'], self.museums(options['museums']))
+        self.step("exhibits", options['exhibits'], self.exhibits(options['exhibits'], museum_ids))
+        visitor_ids = self.users(options['users'], options['prefix'])
+        self.step("bookings", options['bookings'], self.bookings(options['bookings'], visitor_ids, museum_ids, tickets))
+
+        if options['bookings']:
+            # Bulk-inserted bookings bypass the booking views, so derive the daily totals and inventory afterwards
+            self.stdout.write(f"  daily summaries: {occupancy.rebuild()} rows")
+            self.stdout.write(f"  inventory: {inventory.rebuild()} rows")
+        # bulk_create skips post_save, so drop cached catalogue pages and the search index here
+        catalogue.bump_version()
+        catalogue.bump_version(search.VERSION_KEY)
+        if catalogue.is_process_local():
+            self.stderr.write(self.style.WARNING(catalogue.PROCESS_LOCAL_WARNING))
+
+    def step(self, label, total, batches):
+        start = time.perf_counter()
+        ids = []
+        for objs in batches:
+            with transaction.atomic():
+                created = type(objs[0]).objects.bulk_create(objs, batch_size=self.batch_size)
+            ids.extend(obj.pk for obj in created)
+            self.stdout.write(f"\r  {label}: {len(ids)}/{total}", ending='')
+            self.stdout.flush()
+        elapsed = time.perf_counter() - start
+        rate = len(ids) / elapsed if elapsed else 0
+        self.stdout.write(f"\r  {label}: {len(ids)} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)")
+        return ids
+
+    def tickets(self):
+        existing = list(Ticket.objects.all())
+        if existing:
+            return existing
+        return Ticket.objects.bulk_create(Ticket(price=Decimal(price)) for price in TICKET_PRICES)
+
+    def museums(self, count):
+        rng = self.rng
+        objs = (
+            Museum(
+                name=f"{rng.choice(CITIES)} {rng.choice(TOPICS)} {rng.choice(KINDS)} {i}",
+                location=rng.choice(CITIES),
+                daily_capacity=rng.choice([50, 100, 200, 500]),
+                time_slots=TIME_SLOTS,
+            )
+            for i in range(count)
+        )
+        return chunked(objs, self.batch_size)
+
+    def exhibits(self, count, museum_ids):
+        rng = self.rng
+        objs = (
+            Exhibit(
+                name=f"{rng.choice(TOPICS)} collection {i}",
+                description=f"Selected {rng.choice(TOPICS).lower()} from the permanent collection.",
+                museum_id=rng.choice(museum_ids),
+            )
+            for i in range(count)
+        )
+        return chunked(objs, self.batch_size)
+
+    def users(self, count, prefix):
+        # Hashing is deliberately slow, so every user shares one precomputed hash
+        password = make_password(PASSWORD)
+        users = (
+            User(username=f"{prefix}{i}", email=f"{prefix}{i}@example.com", password=password, first_name=f"User {i}")
+            for i in range(count)
+        )
+        user_ids = self.step("users", count, chunked(users, self.batch_size))
+        visitors = (
+            Visitor(user_id=user_id, name=f"User {i}", email=f"{prefix}{i}@example.com", phone=f"03{i:09d}"[:15])
+            for i, user_id in enumerate(user_ids)
+        )
+        return self.step("visitors", count, chunked(visitors, self.batch_size))
+
+    def bookings(self, count, visitor_ids, museum_ids, tickets):
+        rng = self.rng
+        today = date.today()
+        per_visitor, extra = divmod(count, len(visitor_ids)) if visitor_ids else (0, 0)
+
+        def generate():
+            for index, visitor_id in enumerate(visitor_ids):
+                k = per_visitor + (1 if index < extra else 0)
+                # Distinct museums per visitor: one booking per visitor and museum
+                for museum_id in rng.sample(museum_ids, k):
+                    yield Booking(
+                        visitor_id=visitor_id,
+                        museum_id=museum_id,
+                        ticket=rng.choice(tickets),
+                        visit_date=today + timedelta(days=rng.randint(-180, 180)),
+                        slot=rng.choice(SLOTS),
+                        quantity=rng.choice([1, 1, 1, 2, 4]),
+                    )
+
+        return chunked(generate(), self.batch_size)
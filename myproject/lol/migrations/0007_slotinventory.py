@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lol', '0006_alter_booking_options_booking_visit_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='slot',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='museum',
+            name='daily_capacity',
+            field=models.PositiveIntegerField(default=100),
+        ),
+        migrations.CreateModel(
+            name='SlotInventory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('visit_date', models.DateField()),
+                ('slot', models.CharField(blank=True, default='', max_length=20)),
+                ('capacity', models.PositiveIntegerField()),
+                ('remaining', models.PositiveIntegerField()),
+                ('museum', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inventory', to='lol.museum')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('museum', 'visit_date', 'slot'), name='unique_inventory_slot'), models.CheckConstraint(condition=models.Q(('remaining__lte', models.F('capacity'))), name='inventory_remaining_lte_capacity')],
+            },
+        ),
+    ]
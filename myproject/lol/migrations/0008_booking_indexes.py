@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:51
+
+from django.db import migrations, models
+
+
+def split_duplicate_bookings(apps, schema_editor):
+    """
+    Make (visitor, museum) unique before the constraint is added.
+
+    The old booking views checked for an existing booking and then inserted
+    without a lock, so a double submit could leave two rows. Per visitor and
+    museum the oldest booking stays. Later ones that repeat it exactly (same
+    date, slot and ticket) are double submits and are deleted; any other is
+    a real second visit, so it moves to a copy of the visitor (without the
+    user link) and is reported. 0012 later merges those copies back where it can.
+    """
+    Booking = apps.get_model('lol', 'Booking')
+    Visitor = apps.get_model('lol', 'Visitor')
+
+    pairs = (
+        Booking.objects.values('visitor_id', 'museum_id')
+        .annotate(count=models.Count('id'))
+        .filter(count__gt=1)
+        .values_list('visitor_id', 'museum_id')
+    )
+    moved = []
+    for visitor_id, museum_id in list(pairs):
+        bookings = list(Booking.objects.filter(visitor_id=visitor_id, museum_id=museum_id).order_by('booking_date', 'pk'))
+        first, rest = bookings[0], bookings[1:]
+        visitor = Visitor.objects.get(pk=visitor_id)
+        for booking in rest:
+            if (booking.visit_date, booking.slot, booking.ticket_id) == (first.visit_date, first.slot, first.ticket_id):
+                booking.delete()
+                continue
+            copy = Visitor.objects.create(name=visitor.name, email=visitor.email, phone=visitor.phone)
+            booking.visitor_id = copy.pk
+            booking.save(update_fields=['visitor'])
+            moved.append((booking.pk, visitor_id, copy.pk))
+
+    if moved:
+        print(f"\n  {len(moved)} booking(s) duplicated a visitor/museum pair on another date and were moved:")
+        for pk, visitor_id, copy_id in moved:
+            print(f"    booking {pk}: visitor {visitor_id} -> copy {copy_id}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lol', '0007_slotinventory'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['museum', 'visit_date'], name='booking_museum_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['visit_date', 'booking_date'], name='booking_ordering_idx'),
+        ),
+        migrations.RunPython(split_duplicate_bookings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.UniqueConstraint(fields=('visitor', 'museum'), name='unique_booking_per_visitor_museum'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lol', '0009_booking_quantity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='museum',
+            name='img_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lol', '0010_museum_img_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exhibit',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='museum',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,97 @@
+from django.db import migrations
+from django.db.models import F
+from django.db.models.functions import Lower
+
+BATCH_SIZE = 1000
+
+
+def _batches(ids):
+    for start in range(0, len(ids), BATCH_SIZE):
+        yield ids[start:start + BATCH_SIZE]
+
+
+def merge_duplicate_visitors(apps, schema_editor):
+    """
+    Collapse Visitor rows that share an email (case-insensitive) into one.
+
+    The survivor is the row linked to a user, else the oldest. Bookings are
+    re-pointed in batches. Where the survivor already has a booking for the
+    same museum (one booking per visitor/museum) on the same date and slot, the
+    duplicate's quantity is folded into it and the duplicate booking dropped.
+    A clashing booking for another date or slot cannot be merged without moving
+    the visit, so it stays on its duplicate visitor, which is kept and reported.
+    """
+    Visitor = apps.get_model('lol', 'Visitor')
+    Booking = apps.get_model('lol', 'Booking')
+
+    groups = {}
+    unmerged = []
+    rows = (
+        Visitor.objects.exclude(email='')
+        .annotate(key=Lower('email'))
+        .order_by('pk')
+        .values_list('pk', 'key', 'user_id')
+    )
+    for pk, key, user_id in rows.iterator(chunk_size=BATCH_SIZE):
+        groups.setdefault(key, []).append((pk, user_id))
+
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        linked = [pk for pk, user_id in members if user_id is not None]
+        if len(linked) > 1:
+            # Two accounts share an email; they are different people
+            continue
+        survivor = linked[0] if linked else members[0][0]
+        duplicates = [pk for pk, user_id in members if pk != survivor]
+
+        taken = {
+            museum_id: (pk, visit_date, slot)
+            for pk, museum_id, visit_date, slot in (
+                Booking.objects.filter(visitor_id=survivor).values_list('pk', 'museum_id', 'visit_date', 'slot')
+            )
+        }
+        clashing = []
+        kept = []
+        for pk, visitor_id, museum_id, visit_date, slot, quantity in (
+            Booking.objects.filter(visitor_id__in=duplicates)
+            .order_by('pk')
+            .values_list('pk', 'visitor_id', 'museum_id', 'visit_date', 'slot', 'quantity')
+        ):
+            if museum_id not in taken:
+                taken[museum_id] = (pk, visit_date, slot)
+            elif taken[museum_id][1:] == (visit_date, slot):
+                Booking.objects.filter(pk=taken[museum_id][0]).update(quantity=F('quantity') + quantity)
+                clashing.append(pk)
+            else:
+                kept.append((pk, visitor_id))
+
+        for batch in _batches(clashing):
+            Booking.objects.filter(pk__in=batch).delete()
+        movable = list(
+            Booking.objects.filter(visitor_id__in=duplicates)
+            .exclude(pk__in=[pk for pk, visitor_id in kept])
+            .values_list('pk', flat=True)
+        )
+        for batch in _batches(movable):
+            Booking.objects.filter(pk__in=batch).update(visitor_id=survivor)
+        holders = {visitor_id for pk, visitor_id in kept}
+        for batch in _batches([pk for pk in duplicates if pk not in holders]):
+            Visitor.objects.filter(pk__in=batch).delete()
+        unmerged.extend((survivor, pk, visitor_id) for pk, visitor_id in kept)
+
+    if unmerged:
+        print(f"\n  {len(unmerged)} booking(s) clash with a booking on another date or slot and were left unmerged:")
+        for survivor, pk, visitor_id in unmerged:
+            print(f"    booking {pk} stays on visitor {visitor_id} (duplicate of visitor {survivor})")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lol', '0011_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_visitors, migrations.RunPython.noop),
+    ]
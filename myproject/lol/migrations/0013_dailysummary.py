@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lol', '0012_merge_duplicate_visitors'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('visit_date', models.DateField()),
+                ('bookings', models.PositiveIntegerField(default=0)),
+                ('tickets', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('museum', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_summaries', to='lol.museum')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('museum', 'visit_date'), name='unique_daily_summary')],
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:36
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+BATCH_SIZE = 2000
+
+
+def backfill_inventory(apps, schema_editor):
+    """
+    Keep existing schedules bookable and make the inventory match the bookings.
+
+    Every slot a museum already has bookings for becomes one of its
+    time_slots. Inventory rows were created at full capacity regardless of
+    earlier bookings, and slot bookings never counted against the day, so
+    every row's capacity and remaining are recomputed from Booking the same
+    way lol.inventory.rebuild() does.
+    """
+    Museum = apps.get_model('lol', 'Museum')
+    Booking = apps.get_model('lol', 'Booking')
+    SlotInventory = apps.get_model('lol', 'SlotInventory')
+
+    slots = {}
+    for museum_id, slot in Booking.objects.exclude(slot='').order_by('slot').values_list('museum_id', 'slot').distinct():
+        slots.setdefault(museum_id, []).append(slot)
+    museums = Museum.objects.in_bulk(slots.keys())
+    for museum_id, museum in museums.items():
+        museum.time_slots = slots[museum_id]
+    Museum.objects.bulk_update(museums.values(), ['time_slots'], batch_size=BATCH_SIZE)
+
+    bookings = Booking.objects.order_by()
+    days = {
+        (row['museum_id'], row['visit_date']): row['total']
+        for row in bookings.values('museum_id', 'visit_date').annotate(total=Sum('quantity'))
+    }
+    slot_totals = {
+        (row['museum_id'], row['visit_date'], row['slot']): row['total']
+        for row in bookings.exclude(slot='').values('museum_id', 'visit_date', 'slot').annotate(total=Sum('quantity'))
+    }
+    batch = []
+    for row in SlotInventory.objects.select_related('museum').order_by('pk').iterator(chunk_size=BATCH_SIZE):
+        museum = row.museum
+        if row.slot:
+            row.capacity = -(-museum.daily_capacity // len(museum.time_slots)) if museum.time_slots else museum.daily_capacity
+            booked = slot_totals.get((row.museum_id, row.visit_date, row.slot), 0)
+        else:
+            row.capacity = museum.daily_capacity
+            booked = days.get((row.museum_id, row.visit_date), 0)
+        row.remaining = max(0, row.capacity - booked)
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            SlotInventory.objects.bulk_update(batch, ['capacity', 'remaining'])
+            batch = []
+    SlotInventory.objects.bulk_update(batch, ['capacity', 'remaining'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lol', '0013_dailysummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='museum',
+            name='time_slots',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(backfill_inventory, migrations.RunPython.noop),
+    ]
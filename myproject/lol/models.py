@@ -20,15 +20,45 @@ class Museum(models.Model):
     name = models.CharField(max_length=100)
     img = models.ImageField(upload_to='images/', null=True, blank=True)
     location = models.CharField(max_length=200)
+    daily_capacity = models.PositiveIntegerField(default=100)  # Tickets available per day, across all time slots
+    time_slots = models.JSONField(default=list, blank=True)  # Bookable time slots, e.g. ["10:00", "14:00"]; see lol/inventory.py
+    img_variants = models.JSONField(default=dict, blank=True, editable=False)  # Thumbnails written by lol/images.py
+    updated_at = models.DateTimeField(auto_now=True)  # browse.html and museum_detail.html fragment cache key; exhibit writes move it too
 
     def __str__(self):
         return self.name
 
+    @property
+    def slot_capacity(self):
+        """Tickets per time slot: the day's capacity spread over its slots, rounded up."""
+        if not self.time_slots:
+            return self.daily_capacity
+        return -(-self.daily_capacity // len(self.time_slots))
+
+    @property
+    def has_img_variants(self):
+        return bool(self.img) and self.img_variants.get('source') == self.img.name
+
+    def _img_srcset(self, ext):
+        from .images import srcset
+        if not self.has_img_variants:
+            return ''
+        return srcset(self.img.name, self.img_variants['widths'], ext)
+
+    @property
+    def img_srcset_webp(self):
+        return self._img_srcset('webp')
+
+    @property
+    def img_srcset_jpeg(self):
+        return self._img_srcset('jpeg')
+
 
 class Exhibit(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField()
     museum = models.ForeignKey(Museum, on_delete=models.CASCADE, related_name='exhibits')
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -59,13 +89,66 @@ class Booking(models.Model):
     ticket = models.ForeignKey(Ticket, on_delete=models.CASCADE)
     museum = models.ForeignKey(Museum, on_delete=models.CASCADE)
     visit_date = models.DateField(default=timezone.now)  # Date when the visitor plans to visit
+    slot = models.CharField(max_length=20, blank=True, default='')  # Optional time slot, e.g. "10:00"
+    quantity = models.PositiveIntegerField(default=1)  # Number of tickets, e.g. for group bookings
     booking_date = models.DateTimeField(auto_now_add=True)  # Date when the booking was made
 
     class Meta:
         ordering = ['visit_date', 'booking_date']  # Order by visit date, then booking date
+        indexes = [
+            models.Index(fields=['museum', 'visit_date'], name='booking_museum_date_idx'),
+            models.Index(fields=['visit_date', 'booking_date'], name='booking_ordering_idx'),
+        ]
+        constraints = [
+            # One booking per museum per user (Visitor.user is one-to-one); also serves (visitor, museum) lookups
+            models.UniqueConstraint(fields=['visitor', 'museum'], name='unique_booking_per_visitor_museum'),
+        ]
 
     def __str__(self):
         return f"Booking {self.id} by {self.visitor.name} for {self.visit_date}"
 
 
+class SlotInventory(models.Model):
+    """Remaining capacity for one museum on one day (and optionally one time slot).
+
+    The row with slot '' is the whole day and caps every booking; slot rows
+    additionally cap their slot. `remaining` is only ever changed with
+    conditional UPDATEs (see lol/inventory.py) so concurrent bookings can
+    never oversell a day or a slot.
+    """
+    museum = models.ForeignKey(Museum, on_delete=models.CASCADE, related_name='inventory')
+    visit_date = models.DateField()
+    slot = models.CharField(max_length=20, blank=True, default='')
+    capacity = models.PositiveIntegerField()
+    remaining = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['museum', 'visit_date', 'slot'], name='unique_inventory_slot'),
+            models.CheckConstraint(condition=models.Q(remaining__lte=models.F('capacity')), name='inventory_remaining_lte_capacity'),
+        ]
+
+    def __str__(self):
+        slot = f" {self.slot}" if self.slot else ""
+        return f"{self.museum.name} {self.visit_date}{slot}: {self.remaining}/{self.capacity}"
+
+
+class DailySummary(models.Model):
+    """Bookings, tickets and revenue for one museum on one visit date.
 
+    Kept in step with Booking by lol/occupancy.py in the same transaction as
+    every booking and cancellation; `manage.py rebuild_daily_summary` recomputes it.
+    """
+    museum = models.ForeignKey(Museum, on_delete=models.CASCADE, related_name='daily_summaries')
+    visit_date = models.DateField()
+    bookings = models.PositiveIntegerField(default=0)
+    tickets = models.PositiveIntegerField(default=0)  # Sum of Booking.quantity
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)  # Sum of quantity * ticket price
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['museum', 'visit_date'], name='unique_daily_summary'),
+        ]
+
+    def __str__(self):
+        return f"{self.museum.name} {self.visit_date}: {self.tickets} tickets"
@@ -0,0 +1,126 @@
+"""
+Per-museum, per-day booking totals (DailySummary).
+
+Every booking path calls booked()/cancelled() inside the transaction that
+writes the Booking, so "how busy is museum X on day Y" and revenue questions
+are a single-row lookup instead of a COUNT/SUM over Booking and Ticket.
+Counters only move with F() expressions, so concurrent bookings cannot lose
+updates. rebuild() recomputes the table from Booking for backfills.
+"""
+from collections import defaultdict
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+from .models import Booking, DailySummary
+
+REBUILD_BATCH_SIZE = 2000
+
+
+def _apply(museum_id, visit_date, bookings, tickets, revenue):
+    changes = {
+        'bookings': F('bookings') + bookings,
+        'tickets': F('tickets') + tickets,
+        'revenue': F('revenue') + revenue,
+    }
+    if DailySummary.objects.filter(museum_id=museum_id, visit_date=visit_date).update(**changes):
+        return
+    if bookings < 0:
+        return  # Nothing recorded for that day (e.g. booked before the table existed); rebuild fixes it
+    try:
+        # Savepoint so a lost creation race doesn't break the caller's transaction
+        with transaction.atomic():
+            DailySummary.objects.create(
+                museum_id=museum_id, visit_date=visit_date,
+                bookings=bookings, tickets=tickets, revenue=revenue,
+            )
+    except IntegrityError:
+        # Another request created the row first
+        DailySummary.objects.filter(museum_id=museum_id, visit_date=visit_date).update(**changes)
+
+
+def _revenue(booking):
+    return booking.ticket.price * booking.quantity
+
+
+def booked(booking):
+    """Count a new booking. Call inside the transaction that creates it."""
+    _apply(booking.museum_id, booking.visit_date, 1, booking.quantity, _revenue(booking))
+
+
+def booked_many(bookings):
+    """Count several new bookings with one UPDATE per museum and day."""
+    totals = defaultdict(lambda: [0, 0, Decimal('0')])
+    for booking in bookings:
+        total = totals[booking.museum_id, booking.visit_date]
+        total[0] += 1
+        total[1] += booking.quantity
+        total[2] += _revenue(booking)
+    for (museum_id, visit_date), (count, tickets, revenue) in totals.items():
+        _apply(museum_id, visit_date, count, tickets, revenue)
+
+
+def cancelled(booking):
+    """Take a booking back out. Call inside the transaction that deletes it."""
+    _apply(booking.museum_id, booking.visit_date, -1, -booking.quantity, -_revenue(booking))
+
+
+def cancelled_many(bookings):
+    """Take several bookings back out with one UPDATE per museum and day."""
+    totals = defaultdict(lambda: [0, 0, Decimal('0')])
+    for booking in bookings:
+        total = totals[booking.museum_id, booking.visit_date]
+        total[0] -= 1
+        total[1] -= booking.quantity
+        total[2] -= _revenue(booking)
+    for (museum_id, visit_date), (count, tickets, revenue) in totals.items():
+        _apply(museum_id, visit_date, count, tickets, revenue)
+
+
+def get_summary(museum_id, date_from, date_to=None):
+    """Summary rows for a museum between two dates (inclusive), ordered by date."""
+    return DailySummary.objects.filter(
+        museum_id=museum_id,
+        visit_date__gte=date_from,
+        visit_date__lte=date_to or date_from,
+    ).order_by('visit_date')
+
+
+def rebuild(museum_id=None):
+    """Recompute summaries from the Booking table, for one museum or all of them. Returns the row count."""
+    bookings = Booking.objects.all()
+    summaries = DailySummary.objects.all()
+    if museum_id is not None:
+        bookings = bookings.filter(museum_id=museum_id)
+        summaries = summaries.filter(museum_id=museum_id)
+    totals = (
+        bookings.order_by()
+        .values('museum_id', 'visit_date')
+        .annotate(
+            count=Count('id'),
+            ticket_count=Sum('quantity'),
+            amount=Sum(ExpressionWrapper(
+                F('quantity') * F('ticket__price'),
+                output_field=DecimalField(max_digits=12, decimal_places=2),
+            )),
+        )
+        .iterator(chunk_size=REBUILD_BATCH_SIZE)
+    )
+    created = 0
+    with transaction.atomic():
+        summaries.delete()
+        batch = []
+        for row in totals:
+            batch.append(DailySummary(
+                museum_id=row['museum_id'],
+                visit_date=row['visit_date'],
+                bookings=row['count'],
+                tickets=row['ticket_count'],
+                revenue=row['amount'] or 0,
+            ))
+            if len(batch) == REBUILD_BATCH_SIZE:
+                DailySummary.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        DailySummary.objects.bulk_create(batch)
+        created += len(batch)
+    return created
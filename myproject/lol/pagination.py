@@ -0,0 +1,22 @@
+from rest_framework.pagination import CursorPagination
+
+
+class MuseumCursorPagination(CursorPagination):
+    """Keyset pagination over museums by id; cursors are opaque base64 tokens."""
+    ordering = 'id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class BookingCursorPagination(CursorPagination):
+    """Keyset pagination over a user's bookings, matching Booking.Meta.ordering."""
+    ordering = ('visit_date', 'id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+def wants_full_list(request):
+    """Old clients can pass ?all=true to get the unpaginated list response."""
+    return request.query_params.get('all', '').lower() in ('1', 'true', 'yes')
@@ -0,0 +1,136 @@
+"""
+In-memory trigram index over Museum.name and Museum.location.
+
+Replaces the chatbot's "download every museum and run difflib" lookup with a
+server-side search. The index is built once per process, kept up to date by
+the Museum signals in lol/signals.py, and rebuilt only if another process
+changed museums (tracked with a version counter in the shared cache).
+"""
+import re
+import threading
+from collections import Counter, defaultdict
+from . import catalogue
+
+VERSION_KEY = 'lol:search:version'
+LOCATION_WEIGHT = 0.8  # A location hit ranks slightly below an equally good name hit
+
+
+def normalize(text):
+    return re.sub(r'[^a-z0-9]+', ' ', (text or '').lower()).strip()
+
+
+def trigrams(text):
+    """Padded character trigrams of every word, e.g. 'art' -> {'  a', ' ar', 'art', 'rt '}."""
+    grams = set()
+    for word in normalize(text).split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class MuseumIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = None
+        self._docs = {}  # museum id -> (name, location, name trigrams, location trigrams)
+        self._name_postings = defaultdict(set)  # trigram -> museum ids
+        self._location_postings = defaultdict(set)
+
+    def _add(self, museum_id, name, location):
+        name_grams, location_grams = trigrams(name), trigrams(location)
+        self._docs[museum_id] = (name, location, name_grams, location_grams)
+        for gram in name_grams:
+            self._name_postings[gram].add(museum_id)
+        for gram in location_grams:
+            self._location_postings[gram].add(museum_id)
+
+    def _remove(self, museum_id):
+        doc = self._docs.pop(museum_id, None)
+        if doc is None:
+            return
+        for gram in doc[2]:
+            self._name_postings[gram].discard(museum_id)
+        for gram in doc[3]:
+            self._location_postings[gram].discard(museum_id)
+
+    def rebuild(self, version):
+        from .models import Museum
+        rows = Museum.objects.values_list('id', 'name', 'location')
+        with self._lock:
+            self._docs.clear()
+            self._name_postings.clear()
+            self._location_postings.clear()
+            for museum_id, name, location in rows:
+                self._add(museum_id, name, location)
+            self.version = version
+
+    def _is_next(self, version):
+        # Patching in place is only correct if this index was current right before the bump;
+        # otherwise (never built, or another process changed museums) leave it for a rebuild
+        if self.version is not None and self.version == version - 1:
+            return True
+        self.version = None
+        return False
+
+    def update(self, museum_id, name, location, version):
+        """Re-index one museum after it was saved."""
+        with self._lock:
+            if self._is_next(version):
+                self._remove(museum_id)
+                self._add(museum_id, name, location)
+                self.version = version
+
+    def delete(self, museum_id, version):
+        with self._lock:
+            if self._is_next(version):
+                self._remove(museum_id)
+                self.version = version
+
+    def _scores(self, query_grams, postings, doc_slot):
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(postings.get(gram, ()))
+        scores = {}
+        for museum_id, count in shared.items():
+            doc_grams = self._docs[museum_id][doc_slot]
+            scores[museum_id] = count / (len(query_grams) + len(doc_grams) - count)  # Jaccard
+        return scores
+
+    def search(self, query, limit=5, min_score=0.2):
+        """Return [(museum_id, name, location, score)] best first."""
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        with self._lock:
+            name_scores = self._scores(query_grams, self._name_postings, 2)
+            location_scores = self._scores(query_grams, self._location_postings, 3)
+            combined = dict(name_scores)
+            for museum_id, score in location_scores.items():
+                combined[museum_id] = max(combined.get(museum_id, 0), score * LOCATION_WEIGHT)
+            ranked = sorted(
+                (item for item in combined.items() if item[1] >= min_score),
+                key=lambda item: (-item[1], item[0]),
+            )[:limit]
+            return [
+                (museum_id, self._docs[museum_id][0], self._docs[museum_id][1], round(score, 4))
+                for museum_id, score in ranked
+            ]
+
+
+museum_index = MuseumIndex()
+
+
+def get_index():
+    """The process-wide index, rebuilt if museums changed in another process."""
+    version = catalogue.get_version(VERSION_KEY)
+    if museum_index.version != version:
+        museum_index.rebuild(version)
+    return museum_index
+
+
+def museum_saved(museum):
+    museum_index.update(museum.id, museum.name, museum.location, catalogue.bump_version(VERSION_KEY))
+
+
+def museum_deleted(museum_id):
+    museum_index.delete(museum_id, catalogue.bump_version(VERSION_KEY))
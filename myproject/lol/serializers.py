@@ -1,23 +1,30 @@
+from datetime import date
 from django.contrib.auth.models import User
 from rest_framework import serializers
+from .instrumentation import TimedSerializerMixin
 from .models import Museum, Booking, Visitor, Ticket
 
-class MuseumSerializer(serializers.ModelSerializer):
+class MuseumSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    img_srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = Museum
-        fields = '__all__'
+        exclude = ['img_variants']
+
+    def get_img_srcset(self, museum):
+        return {'webp': museum.img_srcset_webp, 'jpeg': museum.img_srcset_jpeg}
 
-class TicketSerializer(serializers.ModelSerializer):
+class TicketSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Ticket
         fields = '__all__'
 
-class VisitorSerializer(serializers.ModelSerializer):
+class VisitorSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Visitor
         fields = '__all__'
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     museum_name = serializers.CharField(source='museum.name', read_only=True)
     visitor_name = serializers.CharField(source='visitor.name', read_only=True)
     ticket_type = serializers.CharField(source='ticket.__str__', read_only=True)
@@ -26,7 +33,45 @@ class BookingSerializer(serializers.ModelSerializer):
         model = Booking
         fields = ['id', 'museum_name', 'visitor_name', 'ticket_type', 'visit_date']
 
-class UserSerializer(serializers.ModelSerializer):
+class BookingItemSerializer(serializers.Serializer):
+    """One line of a bulk booking request."""
+    museum_id = serializers.IntegerField()
+    ticket_id = serializers.IntegerField(required=False)
+    visit_date = serializers.DateField()
+    slot = serializers.CharField(max_length=20, required=False, allow_blank=True, default='')
+    quantity = serializers.IntegerField(min_value=1, max_value=500, default=1)
+
+class BookingExportSerializer(serializers.Serializer):
+    """Query parameters of the bookings export."""
+    museum_id = serializers.IntegerField(required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get('date_from') and attrs.get('date_to') and attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError("date_from must not be after date_to")
+        return attrs
+
+class AvailabilityQuerySerializer(serializers.Serializer):
+    """Query parameters of the availability API."""
+    date = serializers.DateField(required=False)
+    slot = serializers.CharField(max_length=20, required=False, allow_blank=True, default='')
+
+class OccupancyQuerySerializer(serializers.Serializer):
+    """Query parameters of the occupancy API: one day, or an inclusive range of up to a year."""
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        date_from = attrs.setdefault('date_from', date.today())
+        date_to = attrs.setdefault('date_to', date_from)
+        if date_from > date_to:
+            raise serializers.ValidationError("date_from must not be after date_to")
+        if (date_to - date_from).days > 366:
+            raise serializers.ValidationError("The range can span at most 366 days")
+        return attrs
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
 
     class Meta:
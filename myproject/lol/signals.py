@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from . import catalogue, images, search
+from .authentication import auth_version_key
+from .models import Booking, Exhibit, Museum, Visitor
+
+
+@receiver(post_save, sender=Museum)
+@receiver(post_delete, sender=Museum)
+@receiver(post_save, sender=Exhibit)
+@receiver(post_delete, sender=Exhibit)
+def invalidate_catalogue(sender, **kwargs):
+    """Any catalogue write makes previously cached listings stale."""
+    catalogue.bump_version()
+
+
+@receiver(post_save, sender=Exhibit)
+@receiver(post_delete, sender=Exhibit)
+def touch_exhibit_museum(sender, instance, **kwargs):
+    """The museum's cached exhibit list is keyed on its updated_at."""
+    catalogue.touch_museums([instance.museum_id])
+
+
+@receiver(post_save, sender=Museum)
+def queue_image_derivatives(sender, instance, **kwargs):
+    """Render thumbnails in the background when a new image is uploaded."""
+    if instance.img and not instance.has_img_variants:
+        images.schedule_derivatives(instance)
+
+
+@receiver(post_save, sender=Museum)
+def reindex_museum(sender, instance, **kwargs):
+    """Keep the museum search index current without a full rebuild."""
+    search.museum_saved(instance)
+
+
+@receiver(post_delete, sender=Museum)
+def unindex_museum(sender, instance, **kwargs):
+    search.museum_deleted(instance.pk)
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def invalidate_user_bookings(sender, instance, **kwargs):
+    """Changes the ETag of the owner's my_bookings listing."""
+    user_id = Visitor.objects.filter(pk=instance.visitor_id).values_list('user_id', flat=True).first()
+    if user_id is not None:
+        catalogue.bump_version(catalogue.bookings_version_key(user_id))
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_cached_auth(sender, instance, **kwargs):
+    """
+    Deactivation or a password change must not be hidden by CachedJWTAuthentication.
+    QuerySet.update() sends no signal; bump auth_version_key() after one.
+    """
+    catalogue.bump_version(auth_version_key(instance.pk))
@@ -0,0 +1,38 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from lol.authentication import CachedJWTAuthentication
+from lol.token_manager import get_tokens_for_user
+
+
+class CachedJWTRevocationTests(TestCase):
+    """A cached token -> user lookup must not outlive a deactivation or password change."""
+
+    def setUp(self):
+        CachedJWTAuthentication.clear()
+        self.user = User.objects.create_user('bilal', 'bilal@example.com', 'old-password')
+        self.auth = f"Bearer {get_tokens_for_user(self.user)['access']}"
+        self.url = reverse('user_bookings_api')
+
+    def get(self):
+        return self.client.get(self.url, HTTP_AUTHORIZATION=self.auth).status_code
+
+    def test_deactivation_revokes_cached_token(self):
+        self.assertEqual(self.get(), 200)  # Now cached
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get(), 401)
+
+    def test_password_change_revokes_cached_token(self):
+        self.assertEqual(self.get(), 200)
+        self.user.set_password('new-password')
+        self.user.save()
+        self.assertEqual(self.get(), 401)
+
+    @override_settings(WEB_CONCURRENCY=2)
+    def test_no_caching_with_several_workers_on_a_local_cache(self):
+        self.assertFalse(CachedJWTAuthentication.enabled())
+        self.assertEqual(self.get(), 200)
+        # update() sends no signal; only an uncached lookup sees it
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.get(), 401)
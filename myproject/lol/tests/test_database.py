@@ -0,0 +1,74 @@
+"""
+Backend checks that run on whichever database settings.py selects.
+
+`python manage.py test lol` covers SQLite; run it again with POSTGRES_DB (and
+the other POSTGRES_* variables) set to cover the pooled PostgreSQL setup.
+"""
+import threading
+from datetime import date
+from unittest import skipUnless
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+from lol.models import Booking, Museum, SlotInventory, Ticket
+from lol.token_manager import get_tokens_for_user
+
+
+class ConnectionSettingsTests(TestCase):
+    @skipUnless(connection.vendor == 'sqlite', "SQLite settings")
+    def test_sqlite_is_tuned_for_concurrent_writes(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual(cursor.fetchone()[0], 'wal')
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 20000)
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+
+    @skipUnless(connection.vendor == 'postgresql', "PostgreSQL not configured (set POSTGRES_DB)")
+    def test_postgresql_uses_the_connection_pool(self):
+        connection.ensure_connection()
+        self.assertIsNotNone(connection.pool)
+        self.assertEqual(connection.settings_dict['CONN_MAX_AGE'], 0)
+
+
+class ConcurrentBookingTests(TransactionTestCase):
+    """Parallel bookings through the API on the configured backend: no errors, no overselling."""
+
+    users = 40
+    capacity = 10
+
+    def test_parallel_api_bookings(self):
+        museum = Museum.objects.create(name="Mohatta Palace", location="Karachi", daily_capacity=self.capacity)
+        Ticket.objects.create(price=10)
+        users = User.objects.bulk_create(
+            User(username=f'visitor{i}', email=f'visitor{i}@example.com') for i in range(self.users)
+        )
+        tokens = [get_tokens_for_user(user)['access'] for user in users]
+        url = reverse('book_museum_api', args=[museum.id])
+        start = threading.Barrier(self.users)
+        statuses = []
+        lock = threading.Lock()
+
+        def book(token):
+            try:
+                client = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+                start.wait()
+                response = client.post(url)
+                with lock:
+                    statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=book, args=[token]) for token in tokens]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(set(statuses)), [201, 409])
+        self.assertEqual(statuses.count(201), self.capacity)
+        self.assertEqual(Booking.objects.filter(museum=museum).count(), self.capacity)
+        self.assertEqual(SlotInventory.objects.get(museum=museum, visit_date=date.today()).remaining, 0)
@@ -0,0 +1,28 @@
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from lol.models import Ticket
+
+
+class ImportTicketsTests(TestCase):
+    def import_tickets(self, text):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write(text)
+        self.addCleanup(os.remove, f.name)
+        call_command('import_catalogue', 'tickets', f.name, stdout=StringIO(), stderr=StringIO())
+
+    def test_new_rows_keep_their_ids_and_later_creates_do_not_collide(self):
+        self.import_tickets("id,price\n500,10\n501,20\n")
+        self.assertEqual(dict(Ticket.objects.values_list('pk', 'price')), {500: 10, 501: 20})
+
+        ticket = Ticket.objects.create(price=30)
+        self.assertGreater(ticket.pk, 501)
+
+    def test_matched_ids_are_updated(self):
+        ticket = Ticket.objects.create(price=10)
+        self.import_tickets(f"id,price\n{ticket.pk},15\n")
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.price, 15)
+        self.assertEqual(Ticket.objects.count(), 1)
@@ -0,0 +1,61 @@
+from datetime import date
+from unittest import skipUnless
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from lol.models import Booking, Museum, Ticket, Visitor
+
+
+class BookingIndexTests(TestCase):
+    """EXPLAIN the hot Booking queries and check they use the indexes added for them."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user('bilal', 'bilal@example.com', 'pw')
+        cls.visitor = Visitor.objects.create(user=user, name='Bilal', email='bilal@example.com', phone='1')
+        cls.museum = Museum.objects.create(name='Lahore Fort', location='Lahore')
+        ticket = Ticket.objects.create(price=5)
+        Booking.objects.create(visitor=cls.visitor, ticket=ticket, museum=cls.museum, visit_date=date(2030, 1, 1))
+
+    def duplicate_lookup(self):
+        # Before inserting a booking: does this visitor already have one for the museum?
+        return Booking.objects.filter(visitor=self.visitor, museum=self.museum)
+
+    def museum_day_lookup(self):
+        # Visitor lists, exports and occupancy: one museum over a date range
+        return Booking.objects.filter(museum=self.museum, visit_date__gte=date(2030, 1, 1), visit_date__lte=date(2030, 1, 31))
+
+    def default_ordering(self):
+        # Meta.ordering is (visit_date, booking_date); admin and unfiltered listings page through it
+        return Booking.objects.all()[:50]
+
+    def assertUsesIndex(self, queryset, index, **options):
+        plan = queryset.explain(**options)
+        self.assertIn(index, plan, f"{index} not used:\n{plan}")
+
+    def sqlite_unique_index(self, columns):
+        # SQLite builds UniqueConstraints into the table, so the index is named sqlite_autoindex_*
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA index_list('lol_booking')")
+            for _, name, unique, *_ in cursor.fetchall():
+                if unique:
+                    cursor.execute(f"PRAGMA index_info('{name}')")
+                    if [row[2] for row in cursor.fetchall()] == columns:
+                        return name
+        self.fail(f"No unique index on {columns}")
+
+    @skipUnless(connection.vendor == 'sqlite', "SQLite query plans")
+    def test_sqlite_plans(self):
+        # unique_booking_per_visitor_museum
+        self.assertUsesIndex(self.duplicate_lookup(), self.sqlite_unique_index(['visitor_id', 'museum_id']))
+        self.assertUsesIndex(self.museum_day_lookup(), 'booking_museum_date_idx')
+        self.assertUsesIndex(self.default_ordering(), 'booking_ordering_idx')
+
+    @skipUnless(connection.vendor == 'postgresql', "PostgreSQL not configured (set POSTGRES_DB)")
+    def test_postgresql_plans(self):
+        with connection.cursor() as cursor:
+            # The test tables are tiny, so without this the planner would rightly pick a sequential scan
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        self.assertUsesIndex(self.duplicate_lookup(), 'unique_booking_per_visitor_museum')
+        self.assertUsesIndex(self.museum_day_lookup(), 'booking_museum_date_idx')
+        self.assertUsesIndex(self.default_ordering(), 'booking_ordering_idx')
@@ -0,0 +1,58 @@
+import threading
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from lol import instrumentation
+from lol.models import Museum
+from lol.serializers import MuseumSerializer
+
+
+class ServerTimingTests(TestCase):
+    """Serializing the response data and encoding it as JSON are reported separately."""
+
+    def setUp(self):
+        instrumentation.stats.reset()
+
+    def test_browse_museums_reports_serialize_and_render(self):
+        Museum.objects.create(name='Lahore Museum', location='Lahore')
+        response = self.client.get(reverse('browse_museums_api'), {'all': 'true'})
+        self.assertEqual(response.status_code, 200)
+        metrics = [part.split(';')[0] for part in response['Server-Timing'].split(', ')]
+        self.assertEqual(metrics, ['total', 'db', 'template', 'serialize', 'render'])
+
+        stats = instrumentation.stats.snapshot()['views']['browse_museums_api']
+        self.assertEqual(stats['count'], 1)
+        self.assertGreater(stats['serialize_ms']['max'], 0)
+        self.assertGreater(stats['render_ms']['max'], 0)
+
+    def test_serializer_is_timed_once_per_item(self):
+        Museum.objects.create(name='Lahore Museum', location='Lahore')
+        Museum.objects.create(name='Taxila Museum', location='Taxila')
+        timing = instrumentation.RequestTiming()
+        token = instrumentation._current.set(timing)
+        try:
+            data = MuseumSerializer(Museum.objects.all(), many=True).data
+        finally:
+            instrumentation._current.reset(token)
+        self.assertEqual(len(data), 2)
+        self.assertGreater(timing.serialize, 0)
+        self.assertFalse(timing.serializing)
+        self.assertEqual(timing.queries, 1)
+
+
+class StatsTests(SimpleTestCase):
+    def test_concurrent_records_are_all_counted(self):
+        stats = instrumentation.Stats(window=10)
+        timing = instrumentation.RequestTiming()
+
+        def record():
+            for _ in range(2000):
+                stats.record('view', timing, 0.001)
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        view = stats.snapshot()['views']['view']
+        self.assertEqual(view['count'], 16000)
+        self.assertEqual(view['samples'], 10)
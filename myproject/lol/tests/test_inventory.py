@@ -0,0 +1,157 @@
+import threading
+from datetime import date
+from io import StringIO
+from django.contrib.admin.sites import site
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from lol import inventory, occupancy
+from lol.models import Booking, DailySummary, Museum, SlotInventory, Ticket, Visitor
+from lol.token_manager import get_tokens_for_user
+
+
+class ReserveRaceTests(TransactionTestCase):
+    """Many simultaneous bookings for one slot must never oversell it."""
+
+    attempts = 200
+    capacity = 50
+
+    def test_parallel_reservations_do_not_oversell(self):
+        museum = Museum.objects.create(name="Lahore Museum", location="Lahore", daily_capacity=self.capacity)
+        visit_date = date(2030, 1, 1)
+        start = threading.Barrier(self.attempts)
+        results = []
+        lock = threading.Lock()
+
+        def attempt():
+            try:
+                start.wait()
+                try:
+                    with transaction.atomic():
+                        inventory.reserve(museum, visit_date)
+                    outcome = 'ok'
+                except inventory.SoldOut:
+                    outcome = 'sold_out'
+                with lock:
+                    results.append(outcome)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=attempt) for _ in range(self.attempts)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), self.attempts)
+        self.assertEqual(results.count('ok'), self.capacity)
+        self.assertEqual(results.count('sold_out'), self.attempts - self.capacity)
+        row = SlotInventory.objects.get(museum=museum, visit_date=visit_date, slot='')
+        self.assertEqual(row.remaining, 0)
+
+
+class AvailabilityApiTests(TestCase):
+    def test_reports_remaining_and_sold_out(self):
+        museum = Museum.objects.create(name="Small Museum", location="Multan", daily_capacity=2)
+        url = reverse('museum_availability_api', args=[museum.id])
+
+        data = self.client.get(url, {'date': '2030-01-01'}).json()
+        self.assertEqual((data['remaining'], data['sold_out']), (2, False))
+
+        inventory.reserve(museum, date(2030, 1, 1), quantity=2)
+        data = self.client.get(url, {'date': '2030-01-01'}).json()
+        self.assertEqual((data['remaining'], data['sold_out']), (0, True))
+
+
+class SlotTests(TestCase):
+    visit_date = date(2030, 1, 1)
+
+    def setUp(self):
+        self.museum = Museum.objects.create(
+            name="Wazir Khan", location="Lahore", daily_capacity=4, time_slots=['10:00', '14:00'],
+        )
+
+    def remaining(self, slot=''):
+        return SlotInventory.objects.get(museum=self.museum, visit_date=self.visit_date, slot=slot).remaining
+
+    def test_unknown_slot_is_rejected(self):
+        with self.assertRaises(inventory.UnknownSlot):
+            inventory.reserve(self.museum, self.visit_date, 'zz')
+        self.assertFalse(SlotInventory.objects.exists())
+
+    def test_slots_share_the_daily_cap(self):
+        self.assertEqual(self.museum.slot_capacity, 2)
+        inventory.reserve(self.museum, self.visit_date, '10:00', quantity=2)
+        with self.assertRaises(inventory.SoldOut):
+            inventory.reserve(self.museum, self.visit_date, '10:00')
+        inventory.reserve(self.museum, self.visit_date, quantity=1)
+        # One ticket left for the day: the 14:00 slot has room for two but the day does not
+        with self.assertRaises(inventory.SoldOut):
+            inventory.reserve(self.museum, self.visit_date, '14:00', quantity=2)
+        self.assertEqual(self.remaining(), 1)
+        self.assertFalse(SlotInventory.objects.filter(slot='14:00').exists())
+        inventory.reserve(self.museum, self.visit_date, '14:00')
+        with self.assertRaises(inventory.SoldOut):
+            inventory.reserve(self.museum, self.visit_date)
+
+        inventory.release(self.museum.pk, self.visit_date, '10:00', 2)
+        self.assertEqual((self.remaining(), self.remaining('10:00')), (2, 2))
+        self.assertEqual(inventory.remaining_capacity(self.museum, self.visit_date, '14:00'), 1)
+
+    def test_bulk_api_rejects_unknown_and_oversold_slots(self):
+        self.museum.daily_capacity = 1
+        self.museum.save()
+        Ticket.objects.create(price=5)
+        url = reverse('bulk_book_api')
+        statuses = []
+        for i, slot in enumerate(['', '10:00', '14:00', 'zz']):
+            user = User.objects.create(username=f'visitor{i}')
+            response = self.client.post(
+                url, {'items': [{'museum_id': self.museum.pk, 'visit_date': '2030-01-01', 'slot': slot}]},
+                content_type='application/json', HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(user)['access']}",
+            )
+            statuses.append(response.status_code)
+        self.assertEqual(statuses, [201, 409, 409, 400])
+        self.assertEqual(Booking.objects.count(), 1)
+
+
+class ExistingBookingsTests(TestCase):
+    visit_date = date(2030, 1, 1)
+
+    def setUp(self):
+        self.museum = Museum.objects.create(name="Lok Virsa", location="Islamabad", daily_capacity=5, time_slots=['10:00'])
+        self.ticket = Ticket.objects.create(price=10)
+        # Written without reserve(), as seed_data and imports do
+        self.bookings = [
+            Booking.objects.create(
+                visitor=Visitor.objects.create(name=f'V{i}', email=f'v{i}@example.com', phone=''),
+                museum=self.museum, ticket=self.ticket, visit_date=self.visit_date, slot=slot, quantity=quantity,
+            )
+            for i, (slot, quantity) in enumerate([('', 2), ('10:00', 1)])
+        ]
+
+    def test_new_rows_start_from_existing_bookings(self):
+        self.assertEqual(inventory.remaining_capacity(self.museum, self.visit_date), 2)
+        inventory.reserve(self.museum, self.visit_date, '10:00')
+        row = lambda slot: SlotInventory.objects.get(museum=self.museum, visit_date=self.visit_date, slot=slot)
+        self.assertEqual((row('').remaining, row('10:00').remaining), (1, 3))
+
+    def test_rebuild_recomputes_rows(self):
+        inventory.reserve(self.museum, self.visit_date, '10:00')
+        SlotInventory.objects.update(remaining=0)
+        call_command('rebuild_inventory', stdout=StringIO())
+        remaining = dict(SlotInventory.objects.values_list('slot', 'remaining'))
+        self.assertEqual(remaining, {'': 2, '10:00': 4})
+
+    def test_admin_delete_releases_inventory_and_summary(self):
+        inventory.reserve(self.museum, self.visit_date)  # Creates the day row: 5 - 3 booked - 1
+        occupancy.rebuild()
+        admin = site._registry[Booking]
+        admin.delete_model(None, self.bookings[0])
+        self.assertEqual(inventory.remaining_capacity(self.museum, self.visit_date), 3)
+        admin.delete_queryset(None, Booking.objects.filter(pk=self.bookings[1].pk))
+        self.assertEqual(inventory.remaining_capacity(self.museum, self.visit_date), 4)
+        summary = DailySummary.objects.get(museum=self.museum, visit_date=self.visit_date)
+        self.assertEqual((summary.bookings, summary.tickets), (0, 0))
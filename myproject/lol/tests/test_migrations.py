@@ -0,0 +1,70 @@
+from contextlib import redirect_stdout
+from datetime import date
+from io import StringIO
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class MergeDuplicateVisitorsMigrationTests(TransactionTestCase):
+    """0012_merge_duplicate_visitors, run on data shaped like the old booking paths left it."""
+
+    before = [('lol', '0011_updated_at')]
+    after = [('lol', '0012_merge_duplicate_visitors')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        self.apps = executor.loader.project_state(self.before).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def migrate(self):
+        executor = MigrationExecutor(connection)
+        output = StringIO()
+        with redirect_stdout(output):
+            executor.migrate(self.after)
+        return output.getvalue()
+
+    def test_merges_folds_and_keeps(self):
+        User = self.apps.get_model('auth', 'User')
+        Visitor = self.apps.get_model('lol', 'Visitor')
+        Museum = self.apps.get_model('lol', 'Museum')
+        Ticket = self.apps.get_model('lol', 'Ticket')
+        Booking = self.apps.get_model('lol', 'Booking')
+        ticket = Ticket.objects.create(price=10)
+        fort, gallery, archive = (Museum.objects.create(name=name, location='Lahore') for name in ('Fort', 'Gallery', 'Archive'))
+        day, other_day = date(2030, 1, 1), date(2030, 2, 1)
+
+        user = User.objects.create(username='sana', email='sana@example.com')
+        survivor = Visitor.objects.create(user=user, name='Sana', email='sana@example.com', phone='')
+        folded = Visitor.objects.create(name='Sana', email='SANA@example.com', phone='')
+        kept = Visitor.objects.create(name='Sana', email='sana@example.com', phone='')
+        book = lambda visitor, museum, visit_date, quantity=1: Booking.objects.create(
+            visitor=visitor, museum=museum, ticket=ticket, visit_date=visit_date, quantity=quantity,
+        )
+        book(survivor, fort, day)
+        book(survivor, gallery, day)
+        book(folded, fort, day, quantity=2)  # Same museum, date and slot: folded into the survivor's
+        book(folded, archive, other_day)  # No clash: moved to the survivor
+        clash = book(kept, gallery, other_day)  # Same museum, other date: stays on its own visitor
+
+        # Two accounts sharing an email are different people and are left alone
+        first = Visitor.objects.create(user=User.objects.create(username='a1'), name='A', email='shared@example.com', phone='')
+        second = Visitor.objects.create(user=User.objects.create(username='a2'), name='A', email='shared@example.com', phone='')
+        book(first, fort, day)
+        book(second, fort, day)
+
+        output = self.migrate()
+
+        rows = lambda visitor: sorted(
+            Booking.objects.filter(visitor=visitor).values_list('museum__name', 'visit_date', 'quantity')
+        )
+        self.assertEqual(rows(survivor), [('Archive', other_day, 1), ('Fort', day, 3), ('Gallery', day, 1)])
+        self.assertFalse(Visitor.objects.filter(pk=folded.pk).exists())
+        self.assertEqual(rows(kept), [('Gallery', other_day, 1)])
+        self.assertIn(f"booking {clash.pk} stays on visitor {kept.pk}", output)
+        self.assertEqual(rows(first), [('Fort', day, 1)])
+        self.assertEqual(rows(second), [('Fort', day, 1)])
@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from lol.models import Booking, Exhibit, Museum, Ticket, Visitor
+from lol.token_manager import get_tokens_for_user
+from .utils import QueryCountMixin
+
+
+class BookingQueryCountTests(QueryCountMixin, TestCase):
+    """The bookings pages load related rows up front, so their query count doesn't grow with the data."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('ayesha', 'ayesha@example.com', 'pw')
+        cls.visitor = Visitor.objects.create(user=cls.user, name='Ayesha', email='ayesha@example.com', phone='1')
+        cls.ticket = Ticket.objects.create(price=10)
+
+    def add_bookings(self, total):
+        """Bring the user's bookings up to `total`, each at its own museum."""
+        for i in range(Booking.objects.filter(visitor=self.visitor).count(), total):
+            museum = Museum.objects.create(name=f'Museum {i}', location=f'City {i}')
+            Booking.objects.create(
+                visitor=self.visitor, ticket=self.ticket, museum=museum,
+                visit_date=date(2030, 1, 1) + timedelta(days=i),
+            )
+
+    def get_ok(self, url, **extra):
+        response = self.client.get(url, **extra)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_user_bookings_api(self):
+        token = get_tokens_for_user(self.user)['access']
+        url = reverse('user_bookings_api')
+        get = lambda: self.get_ok(url, HTTP_AUTHORIZATION=f'Bearer {token}')
+        get()  # Warm the per-process token -> user cache
+        self.assertConstantQueries(1, get, self.add_bookings)
+
+    def test_mybookings(self):
+        self.client.force_login(self.user)
+        self.assertConstantQueries(3, lambda: self.get_ok(reverse('mybookings')), self.add_bookings)
+
+    def test_admin_changelist(self):
+        self.client.force_login(self.user)
+        url = reverse('admin:lol_booking_changelist')
+        self.assertConstantQueries(5, lambda: self.get_ok(url), self.add_bookings)
+
+
+class MuseumDetailCacheTests(QueryCountMixin, TestCase):
+    """museum_detail.html caches the whole exhibit list per museum, keyed on museum.updated_at."""
+
+    def test_exhibit_list_is_cached_until_an_exhibit_changes(self):
+        museum = Museum.objects.create(name='Taxila Museum', location='Taxila')
+        exhibit = Exhibit.objects.create(museum=museum, name='Fasting Buddha', description='Schist')
+        Exhibit.objects.create(museum=museum, name='Coins', description='Kushan')
+        url = reverse('museum_detail', args=[museum.pk])
+
+        self.assertContains(self.client.get(url), 'Fasting Buddha')
+        # Only the museum lookup: the exhibits query runs inside the cached fragment
+        response = self.assertQueryCount(1, self.client.get, url)
+        self.assertContains(response, 'Coins')
+
+        exhibit.name = 'Bodhisattva'
+        exhibit.save()
+        response = self.client.get(url)
+        self.assertContains(response, 'Bodhisattva')
+        self.assertNotContains(response, 'Fasting Buddha')
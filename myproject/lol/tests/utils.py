@@ -0,0 +1,29 @@
+"""Shared helpers for the lol test suite."""
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryCountMixin:
+    """
+    Query-count assertions for TestCase subclasses.
+
+    Unlike assertNumQueries, assertConstantQueries checks the count at several
+    data sizes, which is what catches an N+1 (a single fixed count can pass by
+    accident when there is only one row).
+    """
+
+    def assertQueryCount(self, expected, func, *args, using=DEFAULT_DB_ALIAS, **kwargs):
+        """Call func(*args, **kwargs), assert it ran `expected` queries, and return its result."""
+        with CaptureQueriesContext(connections[using]) as context:
+            result = func(*args, **kwargs)
+        if len(context) != expected:
+            sql = '\n'.join(f"{i}. {query['sql']}" for i, query in enumerate(context.captured_queries, start=1))
+            self.fail(f"{len(context)} queries executed, {expected} expected:\n{sql}")
+        return result
+
+    def assertConstantQueries(self, expected, func, grow, sizes=(1, 5, 20)):
+        """Assert func() runs `expected` queries after grow(n) brings the data to each size n."""
+        for size in sizes:
+            grow(size)
+            with self.subTest(rows=size):
+                self.assertQueryCount(expected, func)
@@ -1,44 +1,83 @@
 import requests
+from django.conf import settings
+from django.contrib.auth import authenticate
+from rest_framework.exceptions import ValidationError
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# Tokens are minted in-process with simplejwt. Set TOKEN_SERVICE_URL in settings
+# only if tokens must come from another deployment's /lol/api/token/ endpoints.
+REMOTE_TIMEOUT = (3, 5)  # (connect, read) seconds
+_session = None
+
+
+def _remote_session():
+    """Shared keep-alive session so remote calls reuse pooled connections."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
+
+def get_tokens_for_user(user):
+    """Issue an access/refresh pair for an already authenticated user."""
+    refresh = RefreshToken.for_user(user)
+    return {
+        'access': str(refresh.access_token),
+        'refresh': str(refresh)
+    }
+
 
 def get_user_token(username, password):
-    """Get JWT token for user from API"""
-    try:
-        # Your FastAPI endpoint for getting token
-        response = requests.post('https://54c742aad18d.ngrok-free.app/lol/api/token/', {
-            'username': username,
-            'password': password
-        })
-        
-        if response.ok:
-            data = response.json()
-            access = data.get('access')
-            refresh = data.get('refresh')
-            
-            if access and refresh:
-                return {
-                    'access': access,
-                    'refresh': refresh
-                }
-            print("Warning: Received incomplete token data:", data)
+    """Get JWT token for user from credentials"""
+    remote_url = getattr(settings, 'TOKEN_SERVICE_URL', None)
+    if remote_url:
+        try:
+            response = _remote_session().post(f"{remote_url}/lol/api/token/", {
+                'username': username,
+                'password': password
+            }, timeout=REMOTE_TIMEOUT)
+            if response.ok:
+                data = response.json()
+                if data.get('access') and data.get('refresh'):
+                    return {'access': data['access'], 'refresh': data['refresh']}
+                print("Warning: Received incomplete token data:", data)
+        except requests.RequestException as e:
+            print(f"Error getting token: {e}")
         return None
-    except Exception as e:
-        print(f"Error getting token: {e}")
+
+    user = authenticate(username=username, password=password)
+    if user is None:
         return None
+    return get_tokens_for_user(user)
+
 
 def refresh_token(refresh_token):
     """Refresh an expired access token"""
-    try:
-        response = requests.post('https://54c742aad18d.ngrok-free.app/lol/api/token/refresh/', {
-            'refresh': refresh_token
-        })
-        
-        if response.ok:
-            data = response.json()
-            return {
-                'access': data.get('access'),
-                'refresh': data.get('refresh', refresh_token)  # Use old refresh token if new one not provided
-            }
+    remote_url = getattr(settings, 'TOKEN_SERVICE_URL', None)
+    if remote_url:
+        try:
+            response = _remote_session().post(f"{remote_url}/lol/api/token/refresh/", {
+                'refresh': refresh_token
+            }, timeout=REMOTE_TIMEOUT)
+            if response.ok:
+                data = response.json()
+                return {
+                    'access': data.get('access'),
+                    'refresh': data.get('refresh', refresh_token)  # Use old refresh token if new one not provided
+                }
+        except requests.RequestException as e:
+            print(f"Error refreshing token: {e}")
         return None
-    except Exception as e:
-        print(f"Error refreshing token: {e}")
+
+    # Same validation/rotation rules as the /api/token/refresh/ endpoint
+    serializer = TokenRefreshSerializer(data={'refresh': refresh_token})
+    try:
+        serializer.is_valid(raise_exception=True)
+    except (TokenError, ValidationError):
         return None
+    return {
+        'access': serializer.validated_data['access'],
+        'refresh': serializer.validated_data.get('refresh', refresh_token)
+    }
@@ -1,6 +1,6 @@
-from django.urls import path
+from django.urls import path, re_path
 from django.contrib.auth import views as auth_views
-from . import views, api_views
+from . import views, api_views, async_views
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -14,9 +14,20 @@ urlpatterns = [
     path('api/login/', api_views.login_user, name='login_api'),
      # NEW API endpoints for chatbot
     path('api/browse/', views.browse_museums_api, name='browse_museums_api'),
+    path('api/museums/search/', views.search_museums_api, name='search_museums_api'),
+    path('api/museums/<int:museum_id>/occupancy/', views.museum_occupancy_api, name='museum_occupancy_api'),
+    path('api/museums/<int:museum_id>/availability/', views.museum_availability_api, name='museum_availability_api'),
     path('api/book_museum/<int:museum_id>/', views.book_museum_api, name='book_museum_api'),
+    path('api/book/bulk/', views.bulk_book_api, name='bulk_book_api'),
     path('api/my_bookings/', views.user_bookings_api, name='user_bookings_api'),
     path('api/cancel_booking/<int:booking_id>/', views.cancel_booking_api, name='cancel_booking_api'),
+    re_path(r'^api/bookings/export\.(?P<ext>csv|ndjson)$', views.export_bookings_api, name='export_bookings_api'),
+    path('api/perf/stats/', views.perf_stats_api, name='perf_stats_api'),
+    # Async (ASGI) versions of the chatbot endpoints, same payloads
+    path('api/async/browse/', async_views.browse_museums_api, name='async_browse_museums_api'),
+    path('api/async/book_museum/<int:museum_id>/', async_views.book_museum_api, name='async_book_museum_api'),
+    path('api/async/my_bookings/', async_views.user_bookings_api, name='async_user_bookings_api'),
+    path('api/async/cancel_booking/<int:booking_id>/', async_views.cancel_booking_api, name='async_cancel_booking_api'),
     # path('', views.lol_view, name='lol'), # Add the lol view URL
     # path('lolform/', views.lolform_view, name='lol_form'),  # Add a URL for the lol form view
     path('book_museum/<int:museum_id>/', views.book_museum, name='book_museum'),  # URL for booking a museum
@@ -25,4 +36,5 @@ urlpatterns = [
     path('success/', views.success_page, name='success_page'),
     path('register/', views.register, name='register'),  # URL for user registration
     path('mybookings/', views.mybookings, name='mybookings'),
+    path('session_tokens/', views.session_tokens, name='session_tokens'),
 ]
@@ -1,19 +1,29 @@
 
 from django.shortcuts import render, get_object_or_404, redirect
+from django.http import JsonResponse, StreamingHttpResponse
 from .models import Museum, Exhibit, Ticket, Visitor, Booking
 from .forms import BookingForm, UserRegistrationForm
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
-from .token_manager import get_user_token, refresh_token
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, renderer_classes
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from .token_manager import get_tokens_for_user
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.middleware.csrf import get_token
 from rest_framework import status
-from .serializers import MuseumSerializer, BookingSerializer
+from .serializers import MuseumSerializer, BookingSerializer, BookingItemSerializer, BookingExportSerializer, OccupancyQuerySerializer, AvailabilityQuerySerializer
+from .pagination import MuseumCursorPagination, BookingCursorPagination, wants_full_list
 from django.utils import timezone
-from datetime import date
+from django.db import IntegrityError, transaction
+from datetime import date, timedelta
+from . import catalogue, exports, inventory, occupancy, search
+from .authentication import CachedJWTAuthentication
+from .instrumentation import stats as perf_stats, timed_serialization
+from rest_framework.authentication import SessionAuthentication
+from .conditional import bookings_etag, catalogue_etag, not_modified
+from .visitors import existing_visitor, resolve_visitor
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
@@ -38,49 +48,50 @@ from rest_framework_simplejwt.tokens import RefreshToken
 
 def generate_tokens_for_user(request, user):
     """Generate JWT tokens for user and store in session"""
-    refresh = RefreshToken.for_user(user)
-    access_token = str(refresh.access_token)
-    refresh_token = str(refresh)
+    tokens = get_tokens_for_user(user)
     
     # Store both tokens in session
-    request.session['access_token'] = access_token
-    request.session['refresh_token'] = refresh_token
+    request.session['access_token'] = tokens['access']
+    request.session['refresh_token'] = tokens['refresh']
     
-    return {
-        'access': access_token,
-        'refresh': refresh_token
-    }
+    return tokens
 
 def browse(request):
     """View to render the browse.html template with museums data"""
-    museums = Museum.objects.all()
-    context = {'museums': museums}
-    
-    # Add tokens to context if user is authenticated
-    if request.user.is_authenticated:
-        # Check if tokens exist in session
-        access_token = request.session.get('access_token')
-        refresh_token = request.session.get('refresh_token')
-        
-        if access_token and refresh_token:
-            # Tokens exist in session, use them
-            context['access_token'] = {
-                'access': access_token,
-                'refresh': refresh_token
-            }
-        else:
-            # Generate new tokens if they don't exist
-            tokens = generate_tokens_for_user(request, request.user)
-            context['access_token'] = tokens
-    
-    return render(request, 'lol/browse.html', context)
+    museums = catalogue.museum_list()
+    return render(request, 'lol/browse.html', {'museums': museums})
+
+@login_required
+def session_tokens(request):
+    """JWTs for the logged-in session, fetched by the chat widget when it is first used."""
+    access_token = request.session.get('access_token')
+    refresh_token = request.session.get('refresh_token')
+    if access_token and refresh_token:
+        return JsonResponse({'access': access_token, 'refresh': refresh_token})
+    return JsonResponse(generate_tokens_for_user(request, request.user))
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def browse_museums(request):
-    museums = Museum.objects.all()
-    serializer = MuseumSerializer(museums, many=True)
-    return Response(serializer.data)
+    etag = catalogue_etag(request)
+    cached_response = not_modified(request, etag)
+    if cached_response:
+        return cached_response
+
+    def build():
+        museums = Museum.objects.all()
+        if wants_full_list(request):
+            return MuseumSerializer(museums, many=True).data
+
+        paginator = MuseumCursorPagination()
+        page = paginator.paginate_queryset(museums, request)
+        serializer = MuseumSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data).data
+
+    # Keyed on the absolute URL: cursors, page size and host all shape the payload
+    response = Response(catalogue.cached(f'browse_museums:{request.build_absolute_uri()}', build))
+    response['ETag'] = etag
+    return response
 
 
 def museum_detail(request, museum_id):
@@ -93,47 +104,60 @@ def book_museum(request, museum_id):
     museum = get_object_or_404(Museum, id=museum_id)
 
     if request.method == "POST":
-        form = BookingForm(request.POST)
+        form = BookingForm(request.POST, museum=museum)
         if form.is_valid():
-            # Create a new visitor entry for each booking
-            visitor = Visitor.objects.create(
-                user=request.user,
-                name=form.cleaned_data['name'],
-                email=request.user.email,
-                phone=form.cleaned_data['phone']
-            )
-            
-            # Save Booking
-            Booking.objects.create(
-                visitor=visitor,
-                ticket=form.cleaned_data['ticket'],
-                museum=museum,
-                visit_date=form.cleaned_data['visit_date']
-            )
-            return redirect('success_page')
+            try:
+                with transaction.atomic():
+                    # Take the ticket from inventory first; rolls back if anything below fails
+                    inventory.reserve(museum, form.cleaned_data['visit_date'], form.cleaned_data['slot'])
+
+                    # Reuse the user's single visitor profile, refreshing its contact details
+                    visitor = resolve_visitor(
+                        request,
+                        name=form.cleaned_data['name'],
+                        email=form.cleaned_data['email'],
+                        phone=form.cleaned_data['phone']
+                    )
+
+                    # Save Booking
+                    booking = Booking.objects.create(
+                        visitor=visitor,
+                        ticket=form.cleaned_data['ticket'],
+                        museum=museum,
+                        visit_date=form.cleaned_data['visit_date'],
+                        slot=form.cleaned_data['slot']
+                    )
+                    occupancy.booked(booking)
+                return redirect('success_page')
+            except inventory.SoldOut as e:
+                form.add_error('visit_date', str(e))
+            except IntegrityError:
+                form.add_error(None, "You already have a booking for this museum")
     else:
         # Pre-fill form with user data if visitor exists
-        initial_data = {}
-        try:
-            visitor = Visitor.objects.get(user=request.user)
+        visitor = existing_visitor(request)
+        if visitor is not None:
             initial_data = {
                 'name': visitor.name,
                 'email': visitor.email,
                 'phone': visitor.phone
             }
-        except Visitor.DoesNotExist:
+        else:
             initial_data = {
                 'email': request.user.email
             }
-        form = BookingForm(initial=initial_data)
+        form = BookingForm(initial=initial_data, museum=museum)
 
     return render(request, 'lol/booking_form.html', {'form': form, 'museum': museum})
 
 @login_required
 def booking_cancel(request, booking_id):
-    booking = get_object_or_404(Booking, id=booking_id)
+    booking = get_object_or_404(Booking.objects.select_related('ticket'), id=booking_id)
     if request.method == "POST":
-        booking.delete()
+        with transaction.atomic():
+            inventory.release(booking.museum_id, booking.visit_date, booking.slot, booking.quantity)
+            occupancy.cancelled(booking)
+            booking.delete()
         return redirect('browse')  # redirect to browse page
     return render(request, 'lol/cancel_booking.html', {'booking': booking})
 
@@ -150,16 +174,8 @@ def register(request):
             user.set_password(form.cleaned_data['password1'])  # Hash the password
             user.save()  # Now save the user with the hashed password
             
-            # Get token from API
-            tokens = get_user_token(
-                username=user.username,
-                password=form.cleaned_data['password1']
-            )
-            if tokens:
-                request.session['access_token'] = tokens['access']
-                request.session['refresh_token'] = tokens['refresh']
-            
             login(request, user)  # Log the user in
+            generate_tokens_for_user(request, user)  # Minted locally, no HTTP round-trip
             return redirect('home')
     else:
         form = UserRegistrationForm()
@@ -167,11 +183,44 @@ def register(request):
 
 @login_required
 def mybookings(request):
-    bookings = Booking.objects.filter(visitor__user=request.user)
+    bookings = Booking.objects.filter(visitor__user=request.user).select_related('museum', 'visitor__user')
     return render(request, 'lol/my_bookings.html', {'bookings': bookings})
 
 # ============ NEW API ENDPOINTS FOR CHATBOT BOOKING ============
 
+def _reserve_and_create_booking(visitor, ticket, museum, visit_date):
+    """
+    Take a ticket from inventory and create the Booking in one transaction.
+    Shared by the sync and async booking APIs; returns (response data, status).
+    """
+    try:
+        with transaction.atomic():
+            inventory.reserve(museum, visit_date)
+            booking = Booking.objects.create(
+                visitor=visitor,
+                ticket=ticket,
+                museum=museum,
+                visit_date=visit_date
+            )
+            occupancy.booked(booking)
+    except inventory.SoldOut as e:
+        return {"error": str(e)}, status.HTTP_409_CONFLICT
+    except IntegrityError:
+        # unique_booking_per_visitor_museum: user already has a booking for this museum
+        existing_booking = Booking.objects.filter(visitor=visitor, museum=museum).only('id').first()
+        return {
+            "error": "You already have a booking for this museum",
+            "existing_booking_id": existing_booking.id if existing_booking else None
+        }, status.HTTP_400_BAD_REQUEST
+
+    return {
+        "message": "Booking successful!",
+        "booking_id": booking.id,
+        "museum_name": museum.name,
+        "visit_date": booking.visit_date,
+        "ticket_type": ticket.name if hasattr(ticket, 'name') else str(ticket)
+    }, status.HTTP_201_CREATED
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def book_museum_api(request, museum_id):
@@ -182,27 +231,8 @@ def book_museum_api(request, museum_id):
     try:
         museum = get_object_or_404(Museum, id=museum_id)
         
-        # Check if user already has a booking for this museum
-        existing_booking = Booking.objects.filter(
-            visitor__user=request.user, 
-            museum=museum
-        ).first()
-        
-        if existing_booking:
-            return Response({
-                "error": "You already have a booking for this museum",
-                "existing_booking_id": existing_booking.id
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
         # Get or create visitor for this user
-        visitor, created = Visitor.objects.get_or_create(
-            user=request.user,
-            defaults={
-                'name': request.user.get_full_name() or request.user.username,
-                'email': request.user.email,
-                'phone': ''  # You might want to get this from user profile
-            }
-        )
+        visitor = resolve_visitor(request)
         
         # Get default ticket (you might want to make this configurable)
         try:
@@ -216,21 +246,9 @@ def book_museum_api(request, museum_id):
                 "error": "No tickets available for booking"
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Create the booking with tomorrow's date as default
-        booking = Booking.objects.create(
-            visitor=visitor,
-            ticket=default_ticket,
-            museum=museum,
-            visit_date=date.today()  # You can change this logic
-        )
-        
-        return Response({
-            "message": "Booking successful!",
-            "booking_id": booking.id,
-            "museum_name": museum.name,
-            "visit_date": booking.visit_date,
-            "ticket_type": default_ticket.name if hasattr(default_ticket, 'name') else str(default_ticket)
-        }, status=status.HTTP_201_CREATED)
+        # Create the booking with today's date as default
+        data, code = _reserve_and_create_booking(visitor, default_ticket, museum, date.today())
+        return Response(data, status=code)
     
     except Museum.DoesNotExist:
         return Response({
@@ -241,33 +259,209 @@ def book_museum_api(request, museum_id):
             "error": str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-@api_view(['GET'])
+@api_view(['POST'])
 @permission_classes([IsAuthenticated])
-def user_bookings_api(request):
+def bulk_book_api(request):
     """
-    API endpoint to get user's bookings for the chatbot.
+    Book several museums / tickets in one request, e.g. for a school group.
+    Body: {"items": [{"museum_id", "ticket_id"?, "visit_date", "slot"?, "quantity"}]}
+    Everything is validated first; then all bookings are written in one
+    transaction, so either every item is booked or none is.
     """
+    items = request.data.get('items') if isinstance(request.data, dict) else None
+    if not isinstance(items, list) or not items:
+        return Response({"error": "Provide a non-empty 'items' list"}, status=status.HTTP_400_BAD_REQUEST)
+
+    serializer = BookingItemSerializer(data=items, many=True)
+    if not serializer.is_valid():
+        item_errors = serializer.errors
+        # Newer DRF reports many=True errors as {index: errors}, older as a list
+        pairs = item_errors.items() if isinstance(item_errors, dict) else enumerate(item_errors)
+        errors = [{"index": index, "error": error} for index, error in pairs if error]
+        return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+    items = serializer.validated_data
+
+    # Resolve all references with one query per table
+    museums = Museum.objects.in_bulk({item['museum_id'] for item in items})
+    tickets = Ticket.objects.in_bulk({item['ticket_id'] for item in items if 'ticket_id' in item})
+    default_ticket = None if all('ticket_id' in item for item in items) else Ticket.objects.first()
+    already_booked = set(
+        Booking.objects.filter(visitor__user=request.user, museum_id__in=museums.keys())
+        .values_list('museum_id', flat=True)
+    )
+
+    errors = []
+    seen_museums = set()
+    for index, item in enumerate(items):
+        museum_id = item['museum_id']
+        if museum_id not in museums:
+            errors.append({"index": index, "error": "Museum not found"})
+        elif museum_id in already_booked:
+            errors.append({"index": index, "error": "You already have a booking for this museum"})
+        elif museum_id in seen_museums:
+            errors.append({"index": index, "error": "Each museum can only appear once; use quantity instead"})
+        else:
+            try:
+                inventory.check_slot(museums[museum_id], item['slot'])
+            except inventory.UnknownSlot as e:
+                errors.append({"index": index, "error": str(e)})
+        if 'ticket_id' in item and item['ticket_id'] not in tickets:
+            errors.append({"index": index, "error": "Ticket not found"})
+        elif 'ticket_id' not in item and default_ticket is None:
+            errors.append({"index": index, "error": "No tickets available for booking"})
+        seen_museums.add(museum_id)
+    if errors:
+        return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    visitor = resolve_visitor(request)
+
+    bookings = [
+        Booking(
+            visitor=visitor,
+            ticket=tickets[item['ticket_id']] if 'ticket_id' in item else default_ticket,
+            museum=museums[item['museum_id']],
+            visit_date=item['visit_date'],
+            slot=item['slot'],
+            quantity=item['quantity'],
+        )
+        for item in items
+    ]
+    index = 0
     try:
-        bookings = Booking.objects.filter(visitor__user=request.user)
-        booking_data = []
-        
-        for booking in bookings:
-            booking_data.append({
+        with transaction.atomic():
+            for index, booking in enumerate(bookings):
+                inventory.reserve(booking.museum, booking.visit_date, booking.slot, booking.quantity)
+            Booking.objects.bulk_create(bookings)
+            occupancy.booked_many(bookings)
+    except inventory.SoldOut as e:
+        return Response({"errors": [{"index": index, "error": str(e)}]}, status=status.HTTP_409_CONFLICT)
+    except IntegrityError:
+        return Response({"error": "You already have a booking for one of these museums"}, status=status.HTTP_400_BAD_REQUEST)
+
+    # bulk_create skips post_save, so invalidate the my_bookings ETag here
+    catalogue.bump_version(catalogue.bookings_version_key(request.user.pk))
+
+    return Response({
+        "message": "Booking successful!",
+        "bookings": [
+            {
+                "index": index,
                 "booking_id": booking.id,
+                "museum_id": booking.museum_id,
                 "museum_name": booking.museum.name,
-                "museum_location": getattr(booking.museum, 'location', 'Location not specified'),
                 "visit_date": booking.visit_date,
+                "slot": booking.slot,
+                "quantity": booking.quantity,
                 "ticket_type": str(booking.ticket),
-                "created_at": booking.created_at if hasattr(booking, 'created_at') else None,
-            })
-        
-        return Response(booking_data, status=status.HTTP_200_OK)
+            }
+            for index, booking in enumerate(bookings)
+        ]
+    }, status=status.HTTP_201_CREATED)
+
+@timed_serialization
+def _booking_api_data(bookings):
+    """Shape bookings the way the chatbot expects them."""
+    return [
+        {
+            "booking_id": booking.id,
+            "museum_name": booking.museum.name,
+            "museum_location": getattr(booking.museum, 'location', 'Location not specified'),
+            "visit_date": booking.visit_date,
+            "ticket_type": str(booking.ticket),
+            "quantity": booking.quantity,
+            "created_at": booking.created_at if hasattr(booking, 'created_at') else None,
+        }
+        for booking in bookings
+    ]
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def user_bookings_api(request):
+    """
+    API endpoint to get user's bookings for the chatbot.
+    Paginated with opaque next/previous cursors; pass ?all=true for the old plain list.
+    Sends an ETag from the user's booking version and answers If-None-Match with 304.
+    """
+    try:
+        etag = bookings_etag(request)
+        cached_response = not_modified(request, etag)
+        if cached_response:
+            return cached_response
+
+        # One joined query instead of a museum + ticket lookup per row
+        bookings = (
+            Booking.objects.filter(visitor__user=request.user)
+            .select_related('museum', 'ticket')
+            .only('id', 'visit_date', 'quantity', 'museum__name', 'museum__location', 'ticket__id', 'ticket__price')
+        )
+
+        if wants_full_list(request):
+            response = Response(_booking_api_data(bookings), status=status.HTTP_200_OK)
+        else:
+            paginator = BookingCursorPagination()
+            page = paginator.paginate_queryset(bookings, request)
+            response = paginator.get_paginated_response(_booking_api_data(page))
+        response['ETag'] = etag
+        return response
     
     except Exception as e:
         return Response({
             "error": str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+@renderer_classes([JSONRenderer, exports.CSVRenderer, exports.NDJSONRenderer])
+def export_bookings_api(request, ext):
+    """
+    Stream bookings joined with visitor, ticket and museum as CSV or NDJSON.
+    Filter with ?museum_id=&date_from=&date_to= (inclusive ISO dates). Staff only.
+    """
+    params = BookingExportSerializer(data=request.query_params)
+    if not params.is_valid():
+        return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+    filters = params.validated_data
+
+    rows = exports.booking_rows(**filters)
+    response = StreamingHttpResponse(exports.lines(rows, ext), content_type=exports.CONTENT_TYPES[ext])
+    name = '-'.join(['bookings'] + [str(value) for value in filters.values()])
+    response['Content-Disposition'] = f'attachment; filename="{name}.{ext}"'
+    return response
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def museum_occupancy_api(request, museum_id):
+    """
+    Bookings and tickets sold per day for a museum, from the DailySummary table.
+    ?date_from=&date_to= (inclusive, default today). Revenue is only included for staff.
+    """
+    museum = get_object_or_404(Museum.objects.only('id', 'name', 'daily_capacity'), id=museum_id)
+    params = OccupancyQuerySerializer(data=request.query_params)
+    if not params.is_valid():
+        return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+    date_from, date_to = params.validated_data['date_from'], params.validated_data['date_to']
+
+    summaries = {row.visit_date: row for row in occupancy.get_summary(museum.id, date_from, date_to)}
+    days = []
+    for offset in range((date_to - date_from).days + 1):
+        day = date_from + timedelta(days=offset)
+        row = summaries.get(day)
+        entry = {
+            "date": day,
+            "bookings": row.bookings if row else 0,
+            "tickets": row.tickets if row else 0,
+        }
+        if request.user.is_staff:
+            entry["revenue"] = row.revenue if row else 0
+        days.append(entry)
+
+    return Response({
+        "museum_id": museum.id,
+        "museum_name": museum.name,
+        "daily_capacity": museum.daily_capacity,
+        "days": days,
+    }, status=status.HTTP_200_OK)
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def cancel_booking_api(request, booking_id):
@@ -276,7 +470,7 @@ def cancel_booking_api(request, booking_id):
     """
     try:
         booking = get_object_or_404(
-            Booking, 
+            Booking.objects.select_related('museum', 'ticket'),
             id=booking_id, 
             visitor__user=request.user
         )
@@ -285,8 +479,11 @@ def cancel_booking_api(request, booking_id):
         museum_name = booking.museum.name
         visit_date = booking.visit_date
         
-        # Delete the booking
-        booking.delete()
+        # Delete the booking and hand the ticket back to the inventory
+        with transaction.atomic():
+            inventory.release(booking.museum_id, visit_date, booking.slot, booking.quantity)
+            occupancy.cancelled(booking)
+            booking.delete()
         
         return Response({
             "message": f"Booking for {museum_name} on {visit_date} has been cancelled successfully",
@@ -302,29 +499,115 @@ def cancel_booking_api(request, booking_id):
             "error": str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@timed_serialization
+def _museum_api_data(museums):
+    """Shape museums the way the chatbot expects them."""
+    return [
+        {
+            "museum_id": museum.id,
+            "name": museum.name,
+            "description": getattr(museum, 'description', 'No description available'),
+            "location": getattr(museum, 'location', 'Location not specified'),
+            # Add other fields as needed based on your Museum model
+        }
+        for museum in museums
+    ]
+
 @api_view(['GET'])
 def browse_museums_api(request):
     """
     Enhanced API endpoint specifically for chatbot to browse museums.
     Returns data in the format expected by your FastAPI chatbot.
     No authentication required - public endpoint.
+    Paginated with opaque next/previous cursors; pass ?all=true for the old plain list.
+    Sends an ETag from the catalogue version and answers If-None-Match with 304.
     """
     try:
-        museums = Museum.objects.all()
-        museum_data = []
-        
-        for museum in museums:
-            museum_data.append({
-                "museum_id": museum.id,
-                "name": museum.name,
-                "description": getattr(museum, 'description', 'No description available'),
-                "location": getattr(museum, 'location', 'Location not specified'),
-                # Add other fields as needed based on your Museum model
-            })
-        
-        return Response(museum_data, status=status.HTTP_200_OK)
+        etag = catalogue_etag(request)
+        cached_response = not_modified(request, etag)
+        if cached_response:
+            return cached_response
+
+        def build():
+            if wants_full_list(request):
+                return _museum_api_data(catalogue.museum_list())
+
+            paginator = MuseumCursorPagination()
+            page = paginator.paginate_queryset(Museum.objects.all(), request)
+            return paginator.get_paginated_response(_museum_api_data(page)).data
+
+        data = catalogue.cached(f'browse_museums_api:{request.build_absolute_uri()}', build)
+        response = Response(data, status=status.HTTP_200_OK)
+        response['ETag'] = etag
+        return response
     
     except Exception as e:
         return Response({
             "error": str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['GET'])
+def search_museums_api(request):
+    """
+    Ranked fuzzy search over museum names and locations for the chatbot.
+    ?q=<text>&limit=<n, default 5>. No authentication required - public endpoint.
+    """
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({"error": "Provide a search query with ?q="}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = min(max(int(request.query_params.get('limit', 5)), 1), 50)
+    except ValueError:
+        limit = 5
+
+    results = search.get_index().search(query, limit=limit)
+    return Response({
+        "query": query,
+        "results": [
+            {"museum_id": museum_id, "name": name, "location": location, "score": score}
+            for museum_id, name, location, score in results
+        ]
+    }, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+def museum_availability_api(request, museum_id):
+    """
+    Tickets left for a museum on a day (and optional time slot), from SlotInventory.
+    ?date=YYYY-MM-DD (default today)&slot=. No authentication required - public endpoint.
+    """
+    museum = get_object_or_404(Museum.objects.only('id', 'name', 'daily_capacity', 'time_slots'), id=museum_id)
+    params = AvailabilityQuerySerializer(data=request.query_params)
+    if not params.is_valid():
+        return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+    visit_date = params.validated_data.get('date') or date.today()
+    slot = params.validated_data['slot']
+    try:
+        inventory.check_slot(museum, slot)
+    except inventory.UnknownSlot as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    remaining = inventory.remaining_capacity(museum, visit_date, slot)
+    return Response({
+        "museum_id": museum.id,
+        "museum_name": museum.name,
+        "visit_date": visit_date,
+        "slot": slot,
+        "time_slots": museum.time_slots,
+        "capacity": museum.slot_capacity if slot else museum.daily_capacity,
+        "remaining": remaining,
+        "sold_out": remaining == 0,
+    }, status=status.HTTP_200_OK)
+
+@api_view(['GET', 'DELETE'])
+@authentication_classes([SessionAuthentication, CachedJWTAuthentication])
+@permission_classes([IsAdminUser])
+def perf_stats_api(request):
+    """
+    Rolling p50/p95/p99 of wall, DB, template, serialize and render (JSON
+    encode) time per URL name, for this worker process only. DELETE starts a
+    new window.
+    """
+    if request.method == 'DELETE':
+        perf_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return Response(perf_stats.snapshot(), status=status.HTTP_200_OK)
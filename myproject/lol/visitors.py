@@ -0,0 +1,59 @@
+"""
+One Visitor per user.
+
+Every booking path (HTML form, DRF API, bulk API, async API) resolves the
+user's Visitor through here instead of creating rows itself, so the table
+stays at one row per account. The resolved row is memoised on the request,
+so one request never looks it up twice.
+"""
+from .models import Visitor
+
+
+def _defaults(user):
+    return {
+        'name': user.get_full_name() or user.username,
+        'email': user.email,
+        'phone': '',
+    }
+
+
+def resolve_visitor(request, **details):
+    """
+    Return the Visitor for request.user, creating it on first use.
+
+    Any non-empty ``name``/``email``/``phone`` passed in (e.g. from the
+    booking form) overwrite the stored contact details when they differ.
+    """
+    visitor = getattr(request, '_lol_visitor', None)
+    if visitor is None:
+        visitor, created = Visitor.objects.get_or_create(
+            user=request.user, defaults=_defaults(request.user)
+        )
+
+    changed = [
+        field for field, value in details.items()
+        if value and getattr(visitor, field) != value
+    ]
+    if changed:
+        for field in changed:
+            setattr(visitor, field, details[field])
+        visitor.save(update_fields=changed)
+
+    request._lol_visitor = visitor
+    return visitor
+
+
+async def aresolve_visitor(user):
+    """Async counterpart for the ASGI views."""
+    visitor, created = await Visitor.objects.aget_or_create(user=user, defaults=_defaults(user))
+    return visitor
+
+
+def existing_visitor(request):
+    """The user's Visitor if they have one, without creating it."""
+    visitor = getattr(request, '_lol_visitor', None)
+    if visitor is None:
+        visitor = Visitor.objects.filter(user=request.user).first()
+    if visitor is not None:
+        request._lol_visitor = visitor
+    return visitor
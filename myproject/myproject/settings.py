@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 from datetime import timedelta
 import os
+from django.core.exceptions import ImproperlyConfigured
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -20,18 +21,29 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
+# Settings profile: DJANGO_ENV=dev (default) or DJANGO_ENV=prod.
+# prod turns DEBUG off, drops dev-only apps/middleware, caches parsed templates,
+# keeps DB connections open between requests, requires DJANGO_SECRET_KEY and
+# uses a cache shared by all workers.
+DJANGO_ENV = os.environ.get('DJANGO_ENV', 'dev')
+PRODUCTION = DJANGO_ENV == 'prod'
+
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-futm%6&7d8pq$iiqxen7fso_da9dax0c^$_p%d&*^6w@su)$ja'
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    if PRODUCTION:
+        raise ImproperlyConfigured("DJANGO_SECRET_KEY must be set when DJANGO_ENV=prod.")
+    SECRET_KEY = 'django-insecure-futm%6&7d8pq$iiqxen7fso_da9dax0c^$_p%d&*^6w@su)$ja'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get('DJANGO_DEBUG', 'false' if PRODUCTION else 'true').lower() == 'true'
 
 ALLOWED_HOSTS = [
     'localhost',
     '127.0.0.1',
     '.ngrok.io',
     '.ngrok-free.app',
-]
+] + [host for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if host]
 
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000"   # Your Next.js frontend URL
@@ -92,15 +104,28 @@ INSTALLED_APPS = [
     'lol',
     'tailwind',
     'theme',
-    'django_browser_reload',
 ]
 
+# Development-only tooling (live reload on template/static changes)
+DEV_APPS = ['django_browser_reload']
+if not PRODUCTION:
+    INSTALLED_APPS += DEV_APPS
+
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'lol.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'lol.instrumentation.TimedJSONRenderer',  # JSONRenderer plus encode timing
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ),
 }
+JWT_USER_CACHE_SIZE = 1024  # Verified tokens whose user lookup is cached per process
+# Worker processes serving the app (gunicorn reads WEB_CONCURRENCY too). With more than one and a
+# process-local cache, revocations can't reach the other workers, so the JWT user cache is skipped.
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 1))
+PERF_STATS_WINDOW = 1000  # Requests per URL name kept for the percentiles at api/perf/stats/
 
 # JWT settings
 from datetime import timedelta
@@ -108,12 +133,14 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'ROTATE_REFRESH_TOKENS': True,
+    'CHECK_REVOKE_TOKEN': True,  # Tokens issued before a password change stop working
 }
 TAILWIND_APP_NAME = 'theme'
 INTERNAL_IPS = ['127.0.0.1']
 NPM_BIN_PATH = "C:\\Program Files\\nodejs\\npm.cmd"
 
 MIDDLEWARE = [
+    'lol.instrumentation.PerformanceMiddleware',  # Server-Timing header and per-view p50/p95/p99, see lol/instrumentation.py
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -122,16 +149,22 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'django_browser_reload.middleware.BrowserReloadMiddleware',
 ]
+if not DEBUG:
+    # Hashed, precompressed static files from STATIC_ROOT with far-future caching (needs collectstatic);
+    # runserver serves them itself in DEBUG
+    MIDDLEWARE.insert(MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+                      'whitenoise.middleware.WhiteNoiseMiddleware')
+if not PRODUCTION:
+    MIDDLEWARE += ['django_browser_reload.middleware.BrowserReloadMiddleware']
 
 ROOT_URLCONF = 'myproject.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'lol.instrumentation.TimedDjangoTemplates',  # DjangoTemplates plus render timing
         'DIRS': ['templates'],
-        'APP_DIRS': True,
+        'APP_DIRS': not PRODUCTION,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
@@ -141,6 +174,14 @@ TEMPLATES = [
         },
     },
 ]
+if PRODUCTION:
+    # Parse each template once per process instead of on every render
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
 
 WSGI_APPLICATION = 'myproject.wsgi.application'
 
@@ -148,12 +189,69 @@ WSGI_APPLICATION = 'myproject.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
+# PostgreSQL when POSTGRES_DB is set (needs `psycopg[pool]`), otherwise SQLite.
+if os.environ.get('POSTGRES_DB'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ['POSTGRES_DB'],
+            'USER': os.environ.get('POSTGRES_USER', 'postgres'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            # Django's native psycopg pool; replaces CONN_MAX_AGE, which must stay 0 with it
+            'CONN_MAX_AGE': 0,
+            'CONN_HEALTH_CHECKS': PRODUCTION,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.environ.get('POSTGRES_POOL_MIN', 2)),
+                    'max_size': int(os.environ.get('POSTGRES_POOL_MAX', 10)),
+                    'timeout': 10,
+                },
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            # prod: reuse connections for a minute instead of reconnecting per request,
+            # and check them before reuse so a dropped connection doesn't fail a request
+            'CONN_MAX_AGE': 60 if PRODUCTION else 0,
+            'CONN_HEALTH_CHECKS': PRODUCTION,
+            'OPTIONS': {
+                # WAL lets readers run while a booking writes; NORMAL sync is safe with WAL
+                'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+                # Wait for the write lock instead of failing with "database is locked"
+                'timeout': 20,
+                # Take the write lock at BEGIN so read-then-write transactions can't deadlock on upgrade
+                'transaction_mode': 'IMMEDIATE',
+            },
+            # On-disk test database so threaded tests (lol/tests/test_inventory.py) get WAL and the lock timeout
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+        }
+    }
+
+
+# Cache (museum catalogue listings, see lol/catalogue.py, template fragments, and the version
+# counters behind ETags, the search index and the JWT user cache). Those versions only
+# invalidate across workers if every worker shares the cache, so prod uses FileBasedCache
+# (DJANGO_CACHE_DIR); dev keeps the per-process LocMem.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'lol-catalogue',
+        'OPTIONS': {
+            'MAX_ENTRIES': 20000,  # One browse.html card fragment per museum; the default 300 thrashes
+        },
     }
 }
+if PRODUCTION:
+    CACHES['default'].update({
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_DIR', str(BASE_DIR / '.cache')),
+    })
 
 
 # Password validation
@@ -192,9 +290,27 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Outside DEBUG, collectstatic writes content-hashed names plus .gz/.br variants
+# (brotli when the `brotli` package is installed) and WhiteNoise serves them
+# with a one-year immutable Cache-Control.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+            else 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24 * 7  # Uploaded media is never overwritten in place
+MEDIA_ACCEL_REDIRECT_PREFIX = None  # e.g. '/protected-media/' to let nginx send media via X-Accel-Redirect
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
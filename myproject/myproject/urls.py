@@ -15,7 +15,8 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+import re
+from django.urls import path, re_path, include
 from . import views  # Import the views module to access the home view
 from lol.auth_views import CustomLoginView  # Import our custom login view
 
@@ -32,5 +33,15 @@ urlpatterns = [
     path('lol/', include('lol.urls')),
     path('accounts/login/', CustomLoginView.as_view(), name='login'),
     path('accounts/', include('django.contrib.auth.urls')),  # For other auth views
-    path('__reload__/', include('django_browser_reload.urls')),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)  # Serve media files during development
+]
+
+if 'django_browser_reload' in settings.INSTALLED_APPS:
+    urlpatterns += [path('__reload__/', include('django_browser_reload.urls'))]
+
+if settings.DEBUG:
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)  # Serve media files during development
+else:
+    # Production: ranged FileResponse / X-Accel-Redirect with cache headers (static files go through WhiteNoise)
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/')), views.serve_media, name='media'),
+    ]
@@ -1,5 +1,15 @@
+import mimetypes
+import os
+import re
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import render
-from django.http import HttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
 
 def home(request):
     return render(request, 'index.html')
@@ -8,4 +18,67 @@ def about(request):
     return render(request, 'about.html')
 
 def contact(request):
-    return render(request, 'contact.html')
\ No newline at end of file
+    return render(request, 'contact.html')
+
+
+def _file_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def serve_media(request, path):
+    """
+    Serve uploaded media outside DEBUG.
+
+    Hands the file to the front-end server via MEDIA_ACCEL_REDIRECT_PREFIX
+    (nginx X-Accel-Redirect) when configured; otherwise streams it with
+    FileResponse (wsgi.file_wrapper / sendfile) and honours single byte ranges.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except ValueError:
+        raise Http404("Invalid path")
+    if not os.path.isfile(full_path):
+        raise Http404("File not found")
+
+    stat = os.stat(full_path)
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+    accel_prefix = getattr(settings, 'MEDIA_ACCEL_REDIRECT_PREFIX', None)
+
+    if accel_prefix:
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = accel_prefix.rstrip('/') + '/' + path
+    else:
+        match = RANGE_RE.match(request.headers.get('Range', ''))
+        start = end = None
+        if match and any(match.groups()):
+            first, last = match.groups()
+            if first:
+                start, end = int(first), int(last) if last else stat.st_size - 1
+            else:
+                start, end = max(stat.st_size - int(last), 0), stat.st_size - 1
+            end = min(end, stat.st_size - 1)
+            if start > end:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{stat.st_size}'
+                return response
+
+        if start is None:
+            response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+        else:
+            response = StreamingHttpResponse(
+                _file_range(full_path, start, end - start + 1), status=206, content_type=content_type
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            response['Content-Length'] = str(end - start + 1)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}'
+    return response